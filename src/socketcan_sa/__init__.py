@@ -13,12 +13,12 @@ from . import shaper
 
 # Export key public functions per Copilot guidelines
 from .analyzer import analyze
-from .rules import load_rules, RuleError
+from .rules import load_rules, load_rules_from_string, validate_rules, RuleError
 from .shaper import run_bridge
 
 __all__ = [
     # Modules
     "analyzer", "rules", "shaper",
     # Key functions and classes
-    "analyze", "load_rules", "RuleError", "run_bridge"
+    "analyze", "load_rules", "load_rules_from_string", "validate_rules", "RuleError", "run_bridge"
 ]
\ No newline at end of file
@@ -21,6 +21,7 @@ import argparse
 import csv
 import time
 import collections
+from dataclasses import dataclass
 
 try:
     import can 
@@ -38,23 +39,39 @@ except ImportError:  # pragma: no cover
 RECV_TIMEOUT = 0.02     # 20ms timeout for non-blocking receive
 MIN_COUNT_FOR_AVG = 1   # Minimum count to avoid division by zero
 CAN_MAX_DLC = 8         # CAN 2.0 max payload size
+CSV_BATCH_ROWS = 64     # Buffered CSV rows before a writerows() flush
+CSV_BUFFER_SIZE = 1 << 16  # 64 KiB file buffer for CSV export
 
 # Rough overhead; ignoring bit stuffing and ext IDs for simplicity
 # CAN frame overhead bits (SOF, arbitration, control, CRC, EOF, IFS, ACK)
 CAN_FRAME_OVERHEAD_BITS = 47
 
-def _frame_bits(payload_len: int) -> int:
+def _frame_bits(payload_len: int, frames: int = 1) -> int:
     """
     Estimate the total number of bits in a CAN frame given the payload length.
 
+    The estimate is linear, so ``frames`` frames carrying ``payload_len`` payload
+    bytes between them cost ``frames`` overheads plus the payload bits.
+
     Args:
         payload_len (int): The length of the CAN payload in bytes.
+        frames (int): The number of frames the payload is spread over.
 
     Returns:
-        int: The estimated total number of bits in the CAN frame.
+        int: The estimated total number of bits in the CAN frame(s).
     """
     # Rough overhead; ignoring bit stuffing and ext IDs for simplicity
-    return CAN_FRAME_OVERHEAD_BITS + payload_len * 8
+    return frames * CAN_FRAME_OVERHEAD_BITS + payload_len * 8
+
+
+@dataclass(slots=True)
+class _IdStats:
+    """Per-CAN-ID counters for the current reporting window."""
+    count: int = 0                # Frames received
+    bytes: int = 0                # Total payload bytes
+    last_ts: float | None = None  # Timestamp of the previous frame
+    gap_sum_ms: float = 0.0       # Sum of inter-arrival gaps (ms)
+    gap_count: int = 0            # Number of inter-arrival gaps
 
 
 def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path: str | None = None, quiet: bool = False, stop_event=None):
@@ -65,22 +82,17 @@ def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path:
         raise SystemExit(f"Failed to connect to interface '{iface}': {e}") from e
 
     # Dictionary to track statistics per CAN ID during current time window
-    # Key: CAN ID (arbitration_id), Value: {"count": frames, "bytes": total_payload_bytes, "last_ts": timestamp, "gaps_ms": list}
-    # defaultdict automatically creates {"count": 0, "bytes": 0, "last_ts": None, "gaps_ms": []} for new CAN IDs
-    by_id = collections.defaultdict(lambda: {
-        "count": 0, 
-        "bytes": 0, 
-        "last_ts": None, 
-        "gaps_ms": []
-    })
+    # Key: CAN ID (arbitration_id), Value: _IdStats record with running totals
+    # defaultdict automatically creates an empty _IdStats for new CAN IDs
+    by_id = collections.defaultdict(_IdStats)
 
     # Track when current analysis window started
     window_start = time.time()
-    bits_in_window = 0
     csvw = None
+    csv_batch = []  # Completed window rows waiting to be written
 
     if csv_path:
-        f = open(csv_path, "w", newline="")
+        f = open(csv_path, "w", buffering=CSV_BUFFER_SIZE, newline="")
         csvw = csv.writer(f)
         csvw.writerow(["ts_unix", "iface", "bus_load_pct", "id_hex", "fps",
                        "avg_jitter_ms", "avg_len_bytes", "count"])
@@ -89,6 +101,11 @@ def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path:
 
     if not quiet:
         print(f"Analyzing interface={iface} (interval={interval:.2f}s). Press Ctrl+C to stop.")
+
+    # Resolve per-iteration lookups once. The clock is still read for every frame
+    # because jitter needs per-frame timestamps and CSV rows carry wall-clock time.
+    recv = bus.recv
+    clock = time.time
     try:
         while True:
             # Check if we should stop (for testing)
@@ -96,8 +113,8 @@ def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path:
                 break
                 
             # Receive CAN messages with short timeout to allow periodic reporting
-            msg = bus.recv(timeout=RECV_TIMEOUT)
-            now = time.time()
+            msg = recv(timeout=RECV_TIMEOUT)
+            now = clock()
             # Process received message, if any
             if msg is not None:
                 # Validate DLC (Data Length Code) - CAN 2.0 max payload is 8 bytes
@@ -107,22 +124,21 @@ def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path:
 
                 # Get or create statistics record for this CAN ID
                 rec = by_id[msg.arbitration_id]
-                rec["count"] += 1                    # Increment frame counter
-                payload_len = len(msg.data)
-                rec["bytes"] += payload_len        # Add payload size to total
-
-                # simple "jitter": store inter-arrival gaps in ms
-                if rec["last_ts"] is not None:
-                    rec["gaps_ms"].append((now - rec["last_ts"]) * 1000.0)
-                rec["last_ts"] = now
-
-                # accumulate rough frame size for load estimate
-                bits_in_window += _frame_bits(payload_len)
+                rec.count += 1                       # Increment frame counter
+                rec.bytes += len(msg.data)           # Add payload size to total
 
+                # simple "jitter": accumulate inter-arrival gaps in ms
+                if rec.last_ts is not None:
+                    rec.gap_sum_ms += (now - rec.last_ts) * 1000.0
+                    rec.gap_count += 1
+                rec.last_ts = now
 
             # Check if it's time to report statistics
             if now - window_start >= interval:
                 dt = now - window_start
+                # _frame_bits() is linear in payload length, so the window total can be
+                # derived from the per-ID counters instead of being summed frame by frame
+                bits_in_window = sum(_frame_bits(rec.bytes, rec.count) for rec in by_id.values())
                 ts = time.strftime("%H:%M:%S", time.localtime(now))
                 bus_load = min(100.0, (bits_in_window / max(dt, 1e-9)) * 100.0 / bitrate)
                 if not quiet:
@@ -135,13 +151,13 @@ def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path:
                     # Report statistics for each CAN ID seen in this window
                     for cid in sorted(by_id.keys()):
                         rec = by_id[cid]
-                        fps = rec["count"] / dt                           # Frames per second
-                        avg_len = rec["bytes"] / max(MIN_COUNT_FOR_AVG, rec["count"])     # Average payload size
-                        avg_jitter = (sum(rec["gaps_ms"]) / len(rec["gaps_ms"])) if rec["gaps_ms"] else 0.0
+                        fps = rec.count / dt                              # Frames per second
+                        avg_len = rec.bytes / max(MIN_COUNT_FOR_AVG, rec.count)           # Average payload size
+                        avg_jitter = (rec.gap_sum_ms / rec.gap_count) if rec.gap_count else 0.0
                         if not quiet:
-                            console.print(f"  ID=0x{cid:X}  fps={fps:.2f}  avg_jitter={avg_jitter:.2f}ms  avg_len={avg_len:.1f}B  n={rec['count']}")
+                            console.print(f"  ID=0x{cid:X}  fps={fps:.2f}  avg_jitter={avg_jitter:.2f}ms  avg_len={avg_len:.1f}B  n={rec.count}")
                         if csvw:
-                            csvw.writerow([
+                            csv_batch.append((
                                 int(now),
                                 iface,
                                 f"{bus_load:.2f}",
@@ -149,15 +165,19 @@ def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path:
                                 f"{fps:.3f}",
                                 f"{avg_jitter:.3f}",
                                 f"{avg_len:.2f}",
-                                rec["count"],
-                            ])
-                
+                                rec.count,
+                            ))
+
+                # Write completed rows in batches to cut per-row writer overhead
+                if len(csv_batch) >= CSV_BATCH_ROWS:
+                    csvw.writerows(csv_batch)
+                    csv_batch.clear()
+
                 if not quiet:
                     console.print("")  # Blank line after each window
                 
                 # Clear statistics and start new window
                 by_id.clear()
-                bits_in_window = 0
                 window_start = now
 
     except KeyboardInterrupt:
@@ -167,7 +187,11 @@ def analyze(iface: str, interval: float = 1.0, bitrate: int = 500_000, csv_path:
         # Add proper resource cleanup
         bus.shutdown()
         if csvw:
-            f.close()
+            # Flush rows still pending from the last windows; close even if that fails
+            try:
+                csvw.writerows(csv_batch)
+            finally:
+                f.close()
 
 
 def main():
@@ -21,12 +21,25 @@ Returns a normalized dict:
 """
 
 from __future__ import annotations
-from typing import Any, Dict, Set
+from typing import Any, Dict, Set, Tuple
+import functools
 import math
-import yaml
 
 MAX_CAN_ID = 0x1FFFFFFF  # 29-bit (covers 11-bit too)
 
+_MISSING = object()  # sentinel for absent keys (None is a meaningful YAML value)
+
+# Error message templates for the per-entry validation paths
+_E_ID_FORMAT = "{field}: invalid CAN ID format '{val}'"
+_E_ID_TYPE = "{field}: CAN ID must be int or hex/dec string, got {type}"
+_E_ID_RANGE = "{field}: CAN ID 0x{cid:X} out of range [0, 0x{max:X}]"
+_E_LIMIT_NOT_MAPPING = "limits[{key}]: value must be a mapping"
+_E_LIMIT_NO_RATE = "limits[{key}]: missing 'rate' field"
+_E_LIMIT_RATE = "limits[{key}]: rate must be > 0, got {rate}"
+_E_LIMIT_BURST = "limits[{key}]: burst must be >= 1, got {burst}"
+_E_REMAP_IDENTICAL = "actions.remap: from and to are identical (0x{cid:X})"
+_E_REMAP_DUPLICATE = "actions.remap: duplicate 'from' ID 0x{cid:X}"
+
 
 class RuleError(ValueError):
     """Raised when rule parsing or validation fails."""
@@ -56,13 +69,13 @@ def _parse_can_id(val: Any, *, field: str) -> int:
             else:
                 cid = int(s, 10)
         except ValueError:
-            raise RuleError(f"{field}: invalid CAN ID format '{val}'")
+            raise RuleError(_E_ID_FORMAT.format(field=field, val=val))
     else:
-        raise RuleError(f"{field}: CAN ID must be int or hex/dec string, got {type(val).__name__}")
+        raise RuleError(_E_ID_TYPE.format(field=field, type=type(val).__name__))
     
     # Validate range
     if not (0 <= cid <= MAX_CAN_ID):
-        raise RuleError(f"{field}: CAN ID 0x{cid:X} out of range [0, 0x{MAX_CAN_ID:X}]")
+        raise RuleError(_E_ID_RANGE.format(field=field, cid=cid, max=MAX_CAN_ID))
     
     return cid
 
@@ -83,87 +96,151 @@ def load_rules(path: str) -> Dict[str, Any]:
         RuleError: If file cannot be parsed or contains invalid rules
     """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = yaml.safe_load(f) or {}
-    except (OSError, yaml.YAMLError) as e:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
         raise RuleError(f"Failed to load rules from {path}: {e}")
     
+    return _load_yaml_rules(raw, source=f" from {path}")
+
+
+def load_rules_from_string(text: str) -> Dict[str, Any]:
+    """Load and validate shaping rules from a YAML string.
+    
+    Same schema and result as load_rules(), without touching the filesystem.
+    
+    Args:
+        text: YAML rules document
+        
+    Returns:
+        Normalized rules dictionary (see load_rules)
+        
+    Raises:
+        RuleError: If the text cannot be parsed or contains invalid rules
+    """
+    return _load_yaml_rules(text, source="")
+
+
+@functools.lru_cache(maxsize=None)
+def _yaml_api():
+    """Import PyYAML on first use and return ``(yaml, loader_class)``.
+    
+    The loader is libyaml's CSafeLoader when PyYAML was built with it, else
+    the pure-Python SafeLoader. Deferring the import keeps ``import
+    socketcan_sa`` cheap for callers that never parse rules.
+    """
+    import yaml
+    return yaml, getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _load_yaml_rules(document: bytes | str, *, source: str) -> Dict[str, Any]:
+    """Parse a YAML document and validate the resulting rules."""
+    yaml, loader = _yaml_api()
+    try:
+        data = yaml.load(document, Loader=loader) or {}
+    except yaml.YAMLError as e:
+        raise RuleError(f"Failed to load rules{source}: {e}")
+    
+    return validate_rules(data)
+
+
+def _parse_limit(id_key: Any, limit_config: Any) -> Tuple[int, Dict[str, Any]]:
+    """Validate one limits entry and return ``(can_id, {"rate": float, "burst": int})``."""
+    if not isinstance(limit_config, dict):
+        raise RuleError(_E_LIMIT_NOT_MAPPING.format(key=id_key))
+    
+    can_id = _parse_can_id(id_key, field=f"limits[{id_key}]")
+    
+    rate = limit_config.get("rate", _MISSING)
+    if rate is _MISSING:
+        raise RuleError(_E_LIMIT_NO_RATE.format(key=id_key))
+    if not isinstance(rate, (int, float)) or rate <= 0:
+        raise RuleError(_E_LIMIT_RATE.format(key=id_key, rate=rate))
+    
+    burst = limit_config.get("burst")
+    if burst is None:
+        burst = math.ceil(rate)
+    elif not isinstance(burst, int) or burst < 1:
+        raise RuleError(_E_LIMIT_BURST.format(key=id_key, burst=burst))
+    
+    return can_id, {"rate": float(rate), "burst": int(burst)}
+
+
+def _parse_remap(remap_list: list) -> Dict[int, int]:
+    """Validate actions.remap items in order and build the from_id -> to_id mapping."""
+    remap: Dict[int, int] = {}
+    for item in remap_list:
+        if not isinstance(item, dict) or "from" not in item or "to" not in item:
+            raise RuleError("actions.remap: each item must be {from: id, to: id}")
+        
+        from_id = _parse_can_id(item["from"], field="actions.remap.from")
+        to_id = _parse_can_id(item["to"], field="actions.remap.to")
+        
+        if from_id == to_id:
+            raise RuleError(_E_REMAP_IDENTICAL.format(cid=from_id))
+        
+        # A repeated 'from' ID overwrites its entry instead of growing the dict
+        size = len(remap)
+        remap[from_id] = to_id
+        if len(remap) == size:
+            raise RuleError(_E_REMAP_DUPLICATE.format(cid=from_id))
+    return remap
+
+
+def validate_rules(data: Any) -> Dict[str, Any]:
+    """Validate an already-parsed rules document and normalize it.
+    
+    This is the validation half of load_rules(), for callers that build the
+    document themselves (e.g. from JSON or a dict literal).
+    
+    Args:
+        data: Parsed document, normally a mapping with "limits"/"actions"
+        
+    Returns:
+        Normalized rules dictionary (see load_rules)
+        
+    Raises:
+        RuleError: If the document contains invalid rules
+    """
     if not isinstance(data, dict):
         raise RuleError("Top-level YAML must be a mapping")
     
-    result = {
-        "limits": {},
-        "drop": set(),
-        "remap": {},
-    }
+    limits: Dict[int, Dict[str, Any]] = {}
+    drop: Set[int] = set()
+    remap: Dict[int, int] = {}
     
-    # Parse limits section
-    if "limits" in data:
-        limits_data = data["limits"]
+    # Parse limits section (present-but-null still has to fail the mapping check)
+    limits_data = data.get("limits", _MISSING)
+    if limits_data is not _MISSING:
         if not isinstance(limits_data, dict):
             raise RuleError("limits: must be a mapping")
         
-        for id_key, limit_config in limits_data.items():
-            if not isinstance(limit_config, dict):
-                raise RuleError(f"limits[{id_key}]: value must be a mapping")
-            
-            can_id = _parse_can_id(id_key, field=f"limits[{id_key}]")
-            
-            if "rate" not in limit_config:
-                raise RuleError(f"limits[{id_key}]: missing 'rate' field")
-            
-            rate = limit_config["rate"]
-            if not isinstance(rate, (int, float)) or rate <= 0:
-                raise RuleError(f"limits[{id_key}]: rate must be > 0, got {rate}")
-            
-            burst = limit_config.get("burst")
-            if burst is None:
-                burst = math.ceil(rate)
-            elif not isinstance(burst, int) or burst < 1:
-                raise RuleError(f"limits[{id_key}]: burst must be >= 1, got {burst}")
-            
-            result["limits"][can_id] = {
-                "rate": float(rate),
-                "burst": int(burst)
-            }
+        limits = dict(_parse_limit(id_key, limit_config) for id_key, limit_config in limits_data.items())
     
     # Parse actions section
-    if "actions" in data:
-        actions_data = data["actions"]
+    actions_data = data.get("actions", _MISSING)
+    if actions_data is not _MISSING:
         if not isinstance(actions_data, dict):
             raise RuleError("actions: must be a mapping")
         
         # Parse drop list
-        if "drop" in actions_data:
-            drop_list = actions_data["drop"]
+        drop_list = actions_data.get("drop", _MISSING)
+        if drop_list is not _MISSING:
             if not isinstance(drop_list, list):
                 raise RuleError("actions.drop: must be a list")
             
-            for item in drop_list:
-                can_id = _parse_can_id(item, field="actions.drop")
-                result["drop"].add(can_id)
+            drop = {_parse_can_id(item, field="actions.drop") for item in drop_list}
         
         # Parse remap list
-        if "remap" in actions_data:
-            remap_list = actions_data["remap"]
+        remap_list = actions_data.get("remap", _MISSING)
+        if remap_list is not _MISSING:
             if not isinstance(remap_list, list):
                 raise RuleError("actions.remap: must be a list")
             
-            seen_from_ids = set()
-            for item in remap_list:
-                if not isinstance(item, dict) or "from" not in item or "to" not in item:
-                    raise RuleError("actions.remap: each item must be {from: id, to: id}")
-                
-                from_id = _parse_can_id(item["from"], field="actions.remap.from")
-                to_id = _parse_can_id(item["to"], field="actions.remap.to")
-                
-                if from_id == to_id:
-                    raise RuleError(f"actions.remap: from and to are identical (0x{from_id:X})")
-                
-                if from_id in seen_from_ids:
-                    raise RuleError(f"actions.remap: duplicate 'from' ID 0x{from_id:X}")
-                
-                seen_from_ids.add(from_id)
-                result["remap"][from_id] = to_id
-    
-    return result
+            remap = _parse_remap(remap_list)
+    
+    return {
+        "limits": limits,
+        "drop": drop,
+        "remap": remap,
+    }
@@ -1,6 +1,36 @@
+import functools
+import itertools
+import os
 import pytest
 import logging
+import textwrap
+from dataclasses import dataclass
 from pathlib import Path
+from hypothesis import HealthCheck, settings
+
+
+# Properties run 50 fresh random examples each by default. Failures are shrunk and
+# print a @reproduce_failure blob, since there is no example database to replay from.
+# Select another profile with HYPOTHESIS_PROFILE=ci-fast, nightly or default.
+settings.register_profile("ci-fast", max_examples=5, derandomize=True, database=None, deadline=None)
+settings.register_profile(
+    "ci", max_examples=50, database=None, deadline=None, print_blob=True,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+settings.register_profile("nightly", max_examples=1000, deadline=None)
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "ci"))
+
+
+@dataclass(slots=True, frozen=True)
+class FakeFrame:
+    """Lightweight stand-in for can.Message with only the fields analyze() and run_bridge() read."""
+    arbitration_id: int
+    data: bytes
+    is_extended_id: bool = False
+    is_remote_frame: bool = False
+    is_fd: bool = False
+    bitrate_switch: bool = False
+    error_state_indicator: bool = False
 
 
 def pytest_configure(config):
@@ -15,6 +45,71 @@ def setup_logging():
     logging.basicConfig(level=logging.DEBUG)
 
 
+@pytest.fixture(scope="session")
+def fake_frame():
+    """Provide the FakeFrame type for building immutable analyzer and shaper input frames."""
+    return FakeFrame
+
+
+@pytest.fixture(scope="session")
+def time_script():
+    """
+    Build time.time() scripts for analyzer tests.
+
+    Returns a callable ``(start, step, count, *tail)`` producing
+    ``[start, start, start + step, ..., start + (count - 1) * step, *tail]``.
+    """
+    def _build(start, step, count, *tail):
+        return [start, *[start + i * step for i in range(count)], *tail]
+    return _build
+
+
+@pytest.fixture(scope="session")
+def window_grid():
+    """
+    Build clock scripts for back-to-back analyzer windows.
+
+    Returns a cached callable ``(start, num_windows, window_len, frames_per_window, frame_step)``
+    producing a tuple with each window's frame timestamps followed by its boundary.
+    """
+    @functools.lru_cache(maxsize=None)
+    def _build(start, num_windows, window_len, frames_per_window, frame_step):
+        return tuple(
+            t
+            for window_start in (start + window * window_len for window in range(num_windows))
+            for t in (*(window_start + frame * frame_step for frame in range(frames_per_window)),
+                      window_start + window_len)
+        )
+    return _build
+
+
+# YAML literals are reused across tests and parametrized cases; dedent each one once
+_dedent = functools.lru_cache(maxsize=128)(textwrap.dedent)
+
+
+@pytest.fixture(scope="session")
+def yaml_dir(tmp_path_factory):
+    """One scratch directory for rules YAML files, removed with the session's tmp tree."""
+    return tmp_path_factory.mktemp("rules")
+
+
+@pytest.fixture(scope="session")
+def make_yaml(yaml_dir):
+    """
+    Write dedented YAML text into ``yaml_dir`` and return the file path as a string.
+
+    Files are numbered from a session-wide counter, so every call gets a fresh name.
+    Pass ``dedent=False`` for generated YAML that is already flush-left.
+    """
+    counter = itertools.count()
+
+    def _make(yaml_text, dedent=True):
+        path = yaml_dir / f"r{next(counter)}.yaml"
+        path.write_text(_dedent(yaml_text) if dedent else yaml_text, encoding="utf-8")
+        return str(path)
+    return _make
+
+
 @pytest.fixture
 def sample_can_frames():
     """Provide sample CAN frames for testing."""
@@ -50,6 +50,11 @@ class TestFrameBits:
             expected = 47 + payload_len * 8
             assert result == expected, f"Failed for payload_len={payload_len}"
 
+    def test_frame_bits_multiple_frames(self):
+        """Verify the multi-frame estimate equals the sum of per-frame estimates."""
+        payloads = [0, 3, 8, 8, 1]
+        assert _frame_bits(sum(payloads), len(payloads)) == sum(_frame_bits(n) for n in payloads)
+
 
 class TestAnalyzeCore:
     """Test the core analyze() function with mocked CAN bus."""
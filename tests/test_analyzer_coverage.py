@@ -534,6 +534,25 @@ class TestResourceCleanup:
         # File should be properly closed
         mock_file().close.assert_called()
 
+    @patch('socketcan_sa.analyzer.Console')
+    @patch('can.interface.Bus')
+    def test_csv_file_closed_when_final_flush_fails(self, mock_bus_class, mock_console_class):
+        """Test CSV file is closed even if flushing the pending rows raises."""
+        mock_bus = Mock()
+        mock_bus_class.return_value = mock_bus
+        mock_console_class.return_value = Mock()
+        mock_bus.recv.side_effect = KeyboardInterrupt()
+        
+        mock_file = mock_open()
+        with patch('builtins.open', mock_file), \
+             patch('csv.writer') as mock_writer, \
+             patch('builtins.print'), \
+             pytest.raises(OSError, match="disk full"):
+            mock_writer.return_value.writerows.side_effect = OSError("disk full")
+            analyze("test_iface", csv_path="test.csv")
+        
+        mock_file().close.assert_called()
+
 
 class TestMinCountProtection:
     """Test protection against division by zero in average calculations."""
@@ -31,7 +31,11 @@ try:
 except (subprocess.CalledProcessError, FileNotFoundError):
     HAS_VCAN = False
 
-pytestmark = pytest.mark.skipif(not HAS_VCAN, reason="vcan interfaces not available")
+pytestmark = [
+    pytest.mark.skipif(not HAS_VCAN, reason="vcan interfaces not available"),
+    # vcan0/vcan1 are shared kernel interfaces; keep these tests on one xdist worker
+    pytest.mark.xdist_group("vcan"),
+]
 
 
 class TestAnalyzerVcanIntegration:
@@ -11,183 +11,159 @@ Tests performance characteristics including:
 """
 
 import pytest
-import time
-import tempfile
-import os
+import itertools
+import re
 import psutil
-from unittest.mock import Mock, patch
+from unittest.mock import Mock
 from socketcan_sa.analyzer import analyze, _frame_bits
 
+# Console report patterns used by the output assertions
+_ID_RE = re.compile(r"ID=0x[0-9a-fA-F]+")
+_FPS_RE = re.compile(r"fps=\d")
+
+# Shared immutable 3-byte payloads, indexed by the low byte of a frame counter
+_PAYLOAD_PALETTE = tuple(bytes([i, (i + 1) & 0xFF, (i + 2) & 0xFF]) for i in range(256))
+
+
+def _printed_text(mock_console):
+    """Return the first positional argument of each console.print() call as a string."""
+    return [str(c.args[0]) if c.args else "" for c in mock_console.print.call_args_list]
+
+
+def _rss_mb() -> float:
+    """Return the current process resident set size in MB."""
+    return psutil.Process().memory_info().rss / 1024 / 1024
+
+
+@pytest.fixture
+def run_analyze(monkeypatch, benchmark):
+    """
+    Provide a runner that executes analyze() against a scripted bus and clock.
+
+    Console, the CAN bus class, time.time and print are replaced via monkeypatch,
+    so no per-test patcher objects are created. The run is timed by pytest-benchmark
+    so wall-clock results are reported rather than asserted against fixed budgets.
+    """
+    mock_bus = Mock()
+    mock_console = Mock()
+    monkeypatch.setattr('socketcan_sa.analyzer.Console', lambda *a, **k: mock_console)
+    monkeypatch.setattr('can.interface.Bus', lambda *a, **k: mock_bus)
+    monkeypatch.setattr('builtins.print', lambda *a, **k: None)
+
+    def _run(recv_script, time_values, interval=1.0, csv_path=None):
+        """
+        Args:
+            recv_script: Values returned (or exceptions raised) by successive bus.recv() calls
+            time_values: Values returned by successive time.time() calls; the last value
+                plus one second is repeated once the script is exhausted
+            interval: Reporting window passed to analyze()
+            csv_path: Optional CSV export path passed to analyze()
+
+        Returns:
+            Tuple of (mock bus, mock console)
+        """
+        mock_bus.recv.side_effect = recv_script
+        clock = itertools.chain(time_values, itertools.repeat(time_values[-1] + 1.0))
+        monkeypatch.setattr('time.time', clock.__next__)
+
+        # The scripted side effects are consumed by the run, so measure exactly one call
+        benchmark.pedantic(
+            analyze, args=("test_iface",), kwargs={"interval": interval, "csv_path": csv_path},
+            rounds=1, iterations=1,
+        )
+        return mock_bus, mock_console
+
+    return _run
+
+
+def _high_frequency_scenario(fake_frame, time_script):
+    """100 frames of a single ID at 100 fps (10ms spacing) in one window."""
+    test_frame = fake_frame(0x123, b'\x01\x02\x03\x04')
+    start_time = 1000.0
+    num_frames = 100
+
+    # 10ms = 100fps, then window end and an extra tick
+    time_values = time_script(start_time, 0.01, num_frames, start_time + 1.0, start_time + 1.1)
+    recv_script = [test_frame] * num_frames + [None] * 3 + [KeyboardInterrupt()]
+    return recv_script, time_values
+
+
+def _check_high_frequency(mock_bus, mock_console):
+    # Verify frames were processed and FPS was reported
+    assert mock_bus.recv.call_count > 100, "Not enough frames processed"
+    mock_console.print.assert_called()
+    printed = _printed_text(mock_console)
+    assert any(_FPS_RE.search(line) for line in printed), "FPS information should be reported"
+
+
+def _many_ids_scenario(fake_frame, time_script):
+    """50 distinct IDs, each sent twice, in one window."""
+    num_ids = 50
+    frames = [
+        fake_frame(0x100 + i, _PAYLOAD_PALETTE[i & 0xFF])
+        for i in range(num_ids)
+    ]
+    start_time = 1000.0
+
+    # Multiple frames per ID
+    time_values = time_script(start_time, 0.01, num_ids * 2, start_time + 1.0, start_time + 1.1)
+    # Each frame is sent twice, followed by timeouts and a forced exit
+    recv_script = list(itertools.islice(itertools.cycle(frames), len(frames) * 2))
+    recv_script += [None, None, None, KeyboardInterrupt()]
+    return recv_script, time_values
+
+
+def _check_many_ids(mock_bus, mock_console):
+    # Should have processed multiple unique IDs
+    unique_ids = {m.group(0) for line in _printed_text(mock_console) for m in _ID_RE.finditer(line)}
+    assert len(unique_ids) >= 10, f"Expected at least 10 unique IDs, got {len(unique_ids)}"
+
+
+def _memory_stability_scenario(fake_frame, time_script):
+    """500 frames of a single ID at 500 fps spanning two windows."""
+    test_frame = fake_frame(0x300, b'\x01\x02\x03')
+    num_frames = 500
+    start_time = 1000.0
+
+    time_values = time_script(start_time, 0.002, num_frames + 10, start_time + 2.0)  # 500fps
+    recv_script = [test_frame] * num_frames + [None] * 5 + [KeyboardInterrupt()]
+    return recv_script, time_values
+
+
+def _check_memory_stability(mock_bus, mock_console):
+    assert mock_bus.recv.call_count > 500, "Should have processed many frames"
+
+
+# (scenario builder, output check)
+ANALYZE_SCENARIOS = [
+    pytest.param(_high_frequency_scenario, _check_high_frequency, id="high_frequency"),
+    pytest.param(_many_ids_scenario, _check_many_ids, id="many_can_ids"),
+    pytest.param(_memory_stability_scenario, _check_memory_stability, id="memory_stability"),
+]
+
 
 @pytest.mark.timeout(30)  # Prevent hanging
 class TestAnalyzerPerformance:
     """Performance benchmark tests for analyzer functionality."""
     
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_high_frequency_processing_performance(self, mock_time, mock_bus_class, mock_console_class):
-        """Test analyzer can handle high-frequency frame processing."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
-        # Create high-frequency frames (simulate 100+ fps)
-        test_frame = Mock()
-        test_frame.arbitration_id = 0x123
-        test_frame.data = b'\x01\x02\x03\x04'
-        
-        # Generate many timestamps for high frequency
-        start_time = 1000.0
-        frame_interval = 0.01  # 10ms = 100fps
-        num_frames = 100
-        
-        time_values = [start_time]
-        for i in range(num_frames):
-            time_values.append(start_time + i * frame_interval)
-        time_values.append(start_time + 1.0)  # Window end
-        time_values.append(start_time + 1.1)  # Extra time
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= num_frames:
-                return test_frame
-            elif recv_call_count <= num_frames + 3:
-                return None  # Some timeouts
-            else:
-                raise KeyboardInterrupt()  # Force exit
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        # Measure execution time
-        start_real_time = time.perf_counter()
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=1.0)
+    @pytest.mark.parametrize("build, check", ANALYZE_SCENARIOS)
+    def test_analyze_scenario_performance(self, run_analyze, fake_frame, time_script, build, check):
+        """Benchmark analyze() and check memory growth and reporting across traffic scenarios."""
+        recv_script, time_values = build(fake_frame, time_script)
         
-        end_real_time = time.perf_counter()
-        execution_time = end_real_time - start_real_time
+        initial_memory = _rss_mb()
+        mock_bus, mock_console = run_analyze(recv_script, time_values)
+        memory_increase = _rss_mb() - initial_memory
         
-        # Verify performance - should process frames quickly
-        assert execution_time < 5.0, f"High-frequency processing took too long: {execution_time:.2f}s"
-        
-        # Verify frames were processed
-        assert recv_call_count > num_frames, "Not enough frames processed"
-        mock_console.print.assert_called()
-        
-        # Extract FPS from console output to verify performance
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        fps_info = None
-        for call in console_calls:
-            if "fps=" in call:
-                fps_info = call
-                break
-        
-        assert fps_info is not None, "FPS information should be reported"
-        
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_many_can_ids_scalability(self, mock_time, mock_bus_class, mock_console_class):
-        """Test analyzer scalability with many different CAN IDs."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
-        # Create frames with many different IDs
-        num_ids = 50
-        frames = []
-        for i in range(num_ids):
-            frame = Mock()
-            frame.arbitration_id = 0x100 + i
-            frame.data = bytes([i % 256, (i + 1) % 256, (i + 2) % 256])
-            frames.append(frame)
-        
-        # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(num_ids * 2):  # Multiple frames per ID
-            time_values.append(start_time + i * 0.01)
-        time_values.append(start_time + 1.0)
-        time_values.append(start_time + 1.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(frames) * 2:  # Send each frame twice
-                return frames[(recv_call_count - 1) % len(frames)]
-            elif recv_call_count <= len(frames) * 2 + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        # Measure execution time
-        start_real_time = time.perf_counter()
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=1.0)
-        
-        end_real_time = time.perf_counter()
-        execution_time = end_real_time - start_real_time
-        
-        # Should handle many IDs efficiently
-        assert execution_time < 10.0, f"Many IDs processing took too long: {execution_time:.2f}s"
-        
-        # Verify all IDs were processed
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        id_reports = [call for call in console_calls if "ID=" in call]
-        unique_ids = set()
-        for report in id_reports:
-            if "ID=" in report:
-                # Extract ID from report (simplified parsing)
-                for part in report.split():
-                    if part.startswith("ID="):
-                        unique_ids.add(part)
+        # Memory usage should not increase significantly
+        assert memory_increase < 50, f"Memory usage increased too much: {memory_increase:.1f}MB"
         
-        # Should have processed multiple unique IDs
-        assert len(unique_ids) >= 10, f"Expected at least 10 unique IDs, got {len(unique_ids)}"
+        check(mock_bus, mock_console)
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_csv_export_performance_large_dataset(self, mock_time, mock_bus_class, mock_console_class):
+    def test_csv_export_performance_large_dataset(self, run_analyze, fake_frame, tmp_path):
         """Test CSV export performance with large datasets."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
         # Create many frames for CSV export
-        test_frame = Mock()
-        test_frame.arbitration_id = 0x200
-        test_frame.data = b'\x01\x02\x03\x04\x05'
+        test_frame = fake_frame(0x200, b'\x01\x02\x03\x04\x05')
         
         num_windows = 10
         frames_per_window = 20
@@ -196,158 +172,36 @@ class TestAnalyzerPerformance:
         # Generate timestamps for multiple windows
         start_time = 1000.0
         time_values = [start_time]
-        
         for window in range(num_windows):
             window_start = start_time + window * 1.0
-            for frame in range(frames_per_window):
-                time_values.append(window_start + frame * 0.05)  # 20fps per window
+            time_values += [window_start + frame * 0.05 for frame in range(frames_per_window)]  # 20fps
             time_values.append(window_start + 1.0)  # Window boundary
-        
         time_values.append(start_time + num_windows + 1)  # Final time
         
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= total_frames:
-                return test_frame
-            elif recv_call_count <= total_frames + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        # Use temporary file for CSV export
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as temp_file:
-            csv_path = temp_file.name
-        
-        try:
-            # Measure CSV export performance
-            start_real_time = time.perf_counter()
-            
-            with patch('builtins.print'):
-                analyze("test_iface", interval=1.0, csv_path=csv_path)
-            
-            end_real_time = time.perf_counter()
-            execution_time = end_real_time - start_real_time
-            
-            # Should handle large CSV export efficiently
-            assert execution_time < 15.0, f"CSV export took too long: {execution_time:.2f}s"
-            
-            # Verify CSV file was created and has content
-            assert os.path.exists(csv_path), "CSV file should be created"
-            
-            with open(csv_path, 'r') as f:
-                lines = f.readlines()
-                
-            # Should have header + data rows
-            assert len(lines) >= 2, "CSV should have header and data"
-            
-            # Should have multiple data rows (one per window)
-            data_rows = len(lines) - 1  # Exclude header
-            assert data_rows >= 5, f"Should export at least 5 rows, got {data_rows}"
-            
-        finally:
-            # Cleanup
-            if os.path.exists(csv_path):
-                os.unlink(csv_path)
-    
-    def test_frame_bits_calculation_performance(self):
-        """Test performance of frame bits calculation function."""
-        # Test with various payload sizes
-        payload_sizes = [0, 1, 2, 4, 6, 8]
-        iterations = 10000
-        
-        start_time = time.perf_counter()
+        recv_script = [test_frame] * total_frames + [None] * 5 + [KeyboardInterrupt()]
         
-        for _ in range(iterations):
-            for size in payload_sizes:
-                result = _frame_bits(size)
-                assert result > 0, f"Frame bits should be positive for size {size}"
+        csv_file = tmp_path / "out.csv"
         
-        end_time = time.perf_counter()
-        execution_time = end_time - start_time
+        # Benchmark CSV export
+        run_analyze(recv_script, time_values, csv_path=str(csv_file))
         
-        # Should be very fast
-        assert execution_time < 1.0, f"Frame bits calculation too slow: {execution_time:.3f}s"
+        # Verify CSV file was created and has content
+        assert csv_file.exists(), "CSV file should be created"
+        lines = csv_file.read_text().splitlines()
         
-        # Calculate operations per second
-        total_operations = iterations * len(payload_sizes)
-        ops_per_sec = total_operations / execution_time
+        # Should have header + data rows
+        assert len(lines) >= 2, "CSV should have header and data"
         
-        # Should handle at least 10k operations per second
-        assert ops_per_sec > 10000, f"Too slow: {ops_per_sec:.0f} ops/sec"
+        # Should have multiple data rows (one per window)
+        data_rows = len(lines) - 1  # Exclude header
+        assert data_rows >= 9, f"Should export at least 9 rows, got {data_rows}"
     
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus') 
-    @patch('time.time')
-    def test_memory_usage_stability(self, mock_time, mock_bus_class, mock_console_class):
-        """Test that memory usage remains stable during long runs."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
-        # Create frame for processing
-        test_frame = Mock()
-        test_frame.arbitration_id = 0x300
-        test_frame.data = b'\x01\x02\x03'
-        
-        # Simulate longer run with many frames
-        num_frames = 500
-        start_time = 1000.0
+    def test_frame_bits_calculation_performance(self, benchmark):
+        """Benchmark the frame bits calculation across common payload sizes."""
+        payload_sizes = (0, 1, 2, 4, 6, 8)
         
-        time_values = [start_time]
-        for i in range(num_frames + 10):
-            time_values.append(start_time + i * 0.002)  # 500fps
-        time_values.append(start_time + 2.0)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= num_frames:
-                return test_frame
-            elif recv_call_count <= num_frames + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        # Monitor memory usage
-        process = psutil.Process()
-        initial_memory = process.memory_info().rss / 1024 / 1024  # MB
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=1.0)
-        
-        final_memory = process.memory_info().rss / 1024 / 1024  # MB
-        memory_increase = final_memory - initial_memory
-        
-        # Memory usage should not increase significantly
-        assert memory_increase < 50, f"Memory usage increased too much: {memory_increase:.1f}MB"
+        # pytest-benchmark calibrates rounds/iterations and reports median/IQR;
+        # compare against a saved run with --benchmark-compare to catch regressions
+        result = benchmark(lambda: [_frame_bits(size) for size in payload_sizes])
         
-        # Should have processed many frames
-        assert recv_call_count > num_frames, "Should have processed many frames"
+        assert all(bits > 0 for bits in result), "Frame bits should be positive"
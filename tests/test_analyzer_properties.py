@@ -9,690 +9,307 @@ Tests mathematical properties and invariants including:
 - Robustness properties (handling invalid inputs)
 """
 
+import re
+from itertools import accumulate, chain, repeat
 import pytest
-from hypothesis import given, strategies as st, assume, settings
-from unittest.mock import Mock, patch
+from hypothesis import example, given, settings, strategies as st
+from unittest.mock import Mock
 from socketcan_sa.analyzer import _frame_bits, analyze, CAN_MAX_DLC
 
 
-class TestFrameBitsProperties:
-    """Property-based tests for frame bits calculation."""
-    
-    @given(payload_len=st.integers(min_value=0, max_value=CAN_MAX_DLC))
-    def test_frame_bits_formula_property(self, payload_len):
-        """Test that frame bits follow the expected formula."""
-        result = _frame_bits(payload_len)
-        
-        # Should always be positive
-        assert result > 0
-        
-        # Should include payload bits + overhead
-        expected_min = payload_len * 8 + 40  # Rough minimum
-        assert result >= expected_min
-        
-        # Should be reasonable (not too large)
-        expected_max = payload_len * 8 + 100  # Rough maximum
-        assert result <= expected_max
+# Shared zero payload, long enough for the invalid-DLC frames too; analyze() only
+# reads len(frame.data), so every frame can be backed by a slice of it
+_ZERO_PAYLOAD = bytes(CAN_MAX_DLC + 32)
+
+# Shared strategies, built once at import. Frame lists stay short: these tests check
+# per-window invariants, which longer scripts only repeat, not throughput.
+_CAN_ID = st.integers(min_value=0, max_value=0x7FF)
+_DLC = st.integers(min_value=0, max_value=CAN_MAX_DLC)
+_INVALID_DLC = st.integers(min_value=CAN_MAX_DLC + 1, max_value=20)
+_BITRATE = st.integers(min_value=1000, max_value=1000000)
+_GAP_S = st.floats(min_value=0.001, max_value=1.0)  # Inter-arrival time in seconds
+
+# Every property here replays a full analyze() run per example, so these use the
+# small ci-fast profile instead of the suite-wide default
+_ANALYZE_SETTINGS = settings(parent=settings.get_profile("ci-fast"))
+
+# Window header and per-ID report lines, as printed by analyze()
+_METRIC_RE = re.compile(
+    r"bus_load≈(?P<bus_load>[\d.]+)%"
+    r"|ID=0x(?P<id>[0-9A-F]+)\s+fps=(?P<fps>[\d.]+)\s+"
+    r"avg_jitter=(?P<jitter>[\d.]+)ms\s+avg_len=(?P<avg_len>[\d.]+)B\s+n=(?P<count>\d+)"
+)
+
+
+def _metric_matches(mock_console):
+    """Yield _METRIC_RE matches over the string arguments passed to console.print."""
+    for call in mock_console.print.call_args_list:
+        text = call.args[0] if call.args and isinstance(call.args[0], str) else ""
+        yield from _METRIC_RE.finditer(text)
+
+
+class FakeBus:
+    """Bus stand-in: recv() replays frames, then timeouts, then raises KeyboardInterrupt."""
     
-    @given(payload_lengths=st.lists(st.integers(min_value=0, max_value=CAN_MAX_DLC), min_size=2, max_size=10))
-    def test_frame_bits_monotonic_property(self, payload_lengths):
-        """Test that frame bits increase monotonically with payload length."""
-        sorted_lengths = sorted(payload_lengths)
-        
-        for i in range(len(sorted_lengths) - 1):
-            len1, len2 = sorted_lengths[i], sorted_lengths[i + 1]
-            bits1, bits2 = _frame_bits(len1), _frame_bits(len2)
-            
-            if len1 < len2:
-                assert bits1 < bits2, f"Frame bits should increase: {len1}→{bits1}, {len2}→{bits2}"
-            elif len1 == len2:
-                assert bits1 == bits2, f"Frame bits should be equal for same payload: {len1}→{bits1}, {len2}→{bits2}"
+    def __init__(self, frames=(), timeouts=3):
+        self._it = chain(frames, repeat(None, timeouts))
     
-    @given(payload_len=st.integers(min_value=0, max_value=CAN_MAX_DLC))
-    def test_frame_bits_minimum_property(self, payload_len):
-        """Test that frame bits have a reasonable minimum."""
-        result = _frame_bits(payload_len)
-        
-        # Even empty frames should have overhead bits
-        min_expected = 47  # CAN frame overhead
-        assert result >= min_expected, f"Frame should have at least {min_expected} bits for payload {payload_len}"
+    def recv(self, timeout=None):
+        for msg in self._it:
+            return msg
+        raise KeyboardInterrupt
     
-    @given(payload_len=st.integers(min_value=0, max_value=CAN_MAX_DLC))
-    def test_frame_bits_can_range_property(self, payload_len):
-        """Test frame bits are within CAN protocol limits."""
-        result = _frame_bits(payload_len)
-        
-        # Should be within reasonable CAN frame size limits
-        max_can_bits = 8 * 8 + 64 + 20  # Max payload + overhead + margin
-        assert result <= max_can_bits, f"Frame bits {result} too large for CAN protocol"
+    def shutdown(self):
+        pass
 
 
-class TestAnalyzerStatisticalProperties:
-    """Property-based tests for analyzer statistical calculations."""
+class _PatchedAnalyzer:
+    """Mixin patching analyze()'s Console, Bus and print() once per test.
+
+    Tests install their frame script with ``self.bus = FakeBus(frames)`` and their
+    clock script with ``self._set_clock(time_values)``.
+    """
     
-    @given(can_ids=st.lists(st.integers(min_value=0, max_value=0x7FF), min_size=1, max_size=20),
-           payload_lengths=st.lists(st.integers(min_value=0, max_value=CAN_MAX_DLC), min_size=1, max_size=20),
-           bitrate=st.integers(min_value=1000, max_value=1000000))
-    @settings(max_examples=20, deadline=5000)  # Limit for performance
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_bus_load_never_exceeds_100_percent(self, mock_time, mock_bus_class, mock_console_class, 
-                                               can_ids, payload_lengths, bitrate):
-        """Test that calculated bus load never exceeds 100%."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
-        assume(len(can_ids) > 0 and len(payload_lengths) > 0)
-        
-        # Create frames
-        frames = []
-        for i, (can_id, payload_len) in enumerate(zip(can_ids, payload_lengths)):
-            frame = Mock()
-            frame.arbitration_id = can_id
-            frame.data = b'\x00' * payload_len
-            frames.append(frame)
-        
-        # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(len(frames) + 5):
-            time_values.append(start_time + i * 0.01)
-        time_values.append(start_time + 1.0)
-        time_values.append(start_time + 1.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(frames):
-                return frames[recv_call_count - 1]
-            elif recv_call_count <= len(frames) + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=1.0, bitrate=bitrate)
-        
-        # Check that bus load in console output never exceeds 100%
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        for call in console_calls:
-            if "bus_load=" in call and "%" in call:
-                # Extract bus load percentage
-                parts = call.split("bus_load=")
-                if len(parts) > 1:
-                    bus_load_part = parts[1].split("%")[0]
-                    try:
-                        bus_load = float(bus_load_part)
-                        assert bus_load <= 100.0, f"Bus load should not exceed 100%: {bus_load}%"
-                        assert bus_load >= 0.0, f"Bus load should not be negative: {bus_load}%"
-                    except ValueError:
-                        pass  # Skip if parsing fails
+    @pytest.fixture(autouse=True)
+    def _patches(self, monkeypatch):
+        self._monkeypatch = monkeypatch
+        self.bus = FakeBus()
+        self.mock_console = Mock()
+        self.printed = []
+        monkeypatch.setattr('socketcan_sa.analyzer.Console', lambda *a, **k: self.mock_console)
+        monkeypatch.setattr('can.interface.Bus', lambda *a, **k: self.bus)
+        monkeypatch.setattr('builtins.print', lambda *a, **k: self.printed.append(' '.join(map(str, a))))
     
-    @given(frame_count=st.integers(min_value=1, max_value=100),
-           window_duration=st.floats(min_value=0.1, max_value=10.0),
-           can_id=st.integers(min_value=0, max_value=0x7FF))
-    @settings(max_examples=20, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_fps_calculation_property(self, mock_time, mock_bus_class, mock_console_class,
-                                     frame_count, window_duration, can_id):
-        """Test that FPS calculation is mathematically consistent."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
-        # Create frames
-        frame = Mock()
-        frame.arbitration_id = can_id
-        frame.data = b'\x01\x02'
-        
-        # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(frame_count + 5):
-            time_values.append(start_time + i * (window_duration / frame_count))
-        time_values.append(start_time + window_duration)
-        time_values.append(start_time + window_duration + 0.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= frame_count:
-                return frame
-            elif recv_call_count <= frame_count + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=window_duration)
-        
-        # Verify FPS is reasonable
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        for call in console_calls:
-            if f"ID=0x{can_id:X}" in call and "fps=" in call:
-                parts = call.split("fps=")
-                if len(parts) > 1:
-                    fps_part = parts[1].split()[0]
-                    try:
-                        fps = float(fps_part)
-                        expected_fps = frame_count / window_duration
-                        # FPS should be close to expected (within reasonable tolerance)
-                        tolerance = expected_fps * 0.5  # 50% tolerance for mock timing
-                        assert fps >= 0, f"FPS should be non-negative: {fps}"
-                        assert fps <= expected_fps + tolerance, f"FPS too high: {fps} > {expected_fps + tolerance}"
-                    except ValueError:
-                        pass
+    def _fresh_mocks(self):
+        """Reset the console mock and captured prints so each Hypothesis example starts clean."""
+        self.mock_console.reset_mock()
+        self.printed.clear()
+        return self.mock_console
     
-    @given(payload_lengths=st.lists(st.integers(min_value=0, max_value=CAN_MAX_DLC), min_size=1, max_size=50),
-           can_id=st.integers(min_value=0, max_value=0x7FF))
-    @settings(max_examples=15, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_average_payload_length_property(self, mock_time, mock_bus_class, mock_console_class,
-                                           payload_lengths, can_id):
-        """Test that average payload length calculation is correct."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
-        # Create frames with specific payload lengths
-        frames = []
-        for length in payload_lengths:
-            frame = Mock()
-            frame.arbitration_id = can_id
-            frame.data = b'\x00' * length
-            frames.append(frame)
-        
-        # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(len(frames) + 5):
-            time_values.append(start_time + i * 0.01)
-        time_values.append(start_time + 1.0)
-        time_values.append(start_time + 1.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(frames):
-                return frames[recv_call_count - 1]
-            elif recv_call_count <= len(frames) + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=1.0)
-        
-        # Calculate expected average
-        expected_avg = sum(payload_lengths) / len(payload_lengths)
-        
-        # Check reported average in console
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        for call in console_calls:
-            if f"ID=0x{can_id:X}" in call and "avg_len=" in call:
-                parts = call.split("avg_len=")
-                if len(parts) > 1:
-                    avg_part = parts[1].split()[0]
-                    try:
-                        reported_avg = float(avg_part)
-                        # Should be close to expected average
-                        tolerance = 0.1
-                        assert abs(reported_avg - expected_avg) <= tolerance, \
-                            f"Average payload length mismatch: {reported_avg} vs {expected_avg}"
-                    except ValueError:
-                        pass
+    def _set_clock(self, time_values):
+        """Script time.time(): the given values, then the last one plus 1s forever."""
+        clock = chain(time_values, repeat(time_values[-1] + 1.0))
+        self._monkeypatch.setattr('time.time', clock.__next__)
+
+
+class TestFrameBitsProperties:
+    """Invariant checks for frame bits calculation."""
     
-    @given(inter_arrival_times=st.lists(st.floats(min_value=0.001, max_value=1.0), min_size=2, max_size=20),
-           can_id=st.integers(min_value=0, max_value=0x7FF))
-    @settings(max_examples=15, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_jitter_calculation_property(self, mock_time, mock_bus_class, mock_console_class,
-                                        inter_arrival_times, can_id):
-        """Test that jitter calculation properties hold."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
+    def test_frame_bits_all_invariants(self):
+        """Check every classic CAN payload length once instead of sampling it."""
+        bits = [_frame_bits(n) for n in range(CAN_MAX_DLC + 1)]
         
-        # Create frame
-        frame = Mock()
-        frame.arbitration_id = can_id
-        frame.data = b'\x01\x02'
+        # Should always be positive, with overhead bits even for empty frames
+        assert all(b > 0 for b in bits)
+        assert bits[0] >= 47, f"Frame should have at least 47 bits, got {bits[0]}"
         
-        # Generate timestamps based on inter-arrival times
+        # Strictly increasing with payload length
+        assert all(a < b for a, b in zip(bits, bits[1:])), f"Frame bits should increase: {bits}"
+        
+        # Should be within reasonable CAN frame size limits
+        max_can_bits = 8 * 8 + 64 + 20  # Max payload + overhead + margin
+        assert bits[-1] <= max_can_bits, f"Frame bits {bits[-1]} too large for CAN protocol"
+        
+        # Known values: empty frame, 1 byte, max payload
+        assert (bits[0], bits[1], bits[8]) == (47, 55, 111)
+
+
+class TestAnalyzerStatisticalProperties(_PatchedAnalyzer):
+    """Property-based tests for analyzer statistical calculations."""
+    
+    @_ANALYZE_SETTINGS
+    @given(data=st.data())
+    def test_analyze_statistics_composite(self, fake_frame, data):
+        """Check bus load, FPS, average length and jitter for several IDs from a single analyze() run."""
+        mock_console = self._fresh_mocks()
+        
+        id_pool = data.draw(st.lists(_CAN_ID, min_size=1, max_size=3, unique=True), label="id_pool")
+        payload_lengths = data.draw(st.lists(_DLC, min_size=2, max_size=8), label="payload_lengths")
+        frame_count = len(payload_lengths)
+        frame_ids = data.draw(st.lists(st.sampled_from(id_pool), min_size=frame_count, max_size=frame_count),
+                              label="frame_ids")
+        inter_arrival_times = data.draw(st.lists(_GAP_S, min_size=frame_count - 1, max_size=frame_count - 1),
+                                        label="inter_arrival_times")
+        bitrate = data.draw(_BITRATE, label="bitrate")
+        
+        # One frame per payload length, spaced by the drawn inter-arrival times
+        frames = [fake_frame(cid, _ZERO_PAYLOAD[:length]) for cid, length in zip(frame_ids, payload_lengths)]
         start_time = 1000.0
-        time_values = [start_time]
-        current_time = start_time
-        
-        for interval in inter_arrival_times:
-            current_time += interval
-            time_values.append(current_time)
-        
-        time_values.append(current_time + 1.0)  # Window end
-        time_values.append(current_time + 1.1)  # Extra time
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(inter_arrival_times):
-                return frame
-            elif recv_call_count <= len(inter_arrival_times) + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=2.0)  # Longer window to capture all frames
-        
-        # Jitter should be non-negative
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        for call in console_calls:
-            if f"ID=0x{can_id:X}" in call and "avg_jitter=" in call:
-                parts = call.split("avg_jitter=")
-                if len(parts) > 1:
-                    jitter_part = parts[1].split("ms")[0]
-                    try:
-                        jitter = float(jitter_part)
-                        assert jitter >= 0, f"Jitter should be non-negative: {jitter}ms"
-                        # Jitter should be reasonable compared to inter-arrival times
-                        max_interval = max(inter_arrival_times) * 1000  # Convert to ms
-                        assert jitter <= max_interval * 2, f"Jitter too large: {jitter}ms vs max interval {max_interval}ms"
-                    except ValueError:
-                        pass
+        frame_times = list(accumulate(inter_arrival_times, initial=start_time))
+        span = frame_times[-1] - start_time
+        window_end = frame_times[-1] + 1.0
+        
+        self._set_clock([start_time, *frame_times, window_end, window_end + 0.1])
+        self.bus = FakeBus(frames)
+        
+        # Window closes on the first timeout, so every frame lands in it
+        analyze("test_iface", interval=span + 0.5, bitrate=bitrate)
+        
+        # Bus load sums every ID's frames in the window
+        dt = window_end - start_time
+        bits = frame_count * 47 + sum(payload_lengths) * 8
+        expected_load = min(100.0, bits / dt * 100.0 / bitrate)
+        
+        # Per-ID (fps, avg_len, jitter), with jitter over the gaps between that ID's own frames
+        expected_rows = {}
+        for cid in set(frame_ids):
+            lengths = [n for fid, n in zip(frame_ids, payload_lengths) if fid == cid]
+            times = [t for fid, t in zip(frame_ids, frame_times) if fid == cid]
+            gaps = [(b - a) * 1000 for a, b in zip(times, times[1:])]
+            expected_rows[f"{cid:X}"] = (len(lengths) / dt, sum(lengths) / len(lengths),
+                                         sum(gaps) / len(gaps) if gaps else 0.0)
+        
+        # Collect every reported metric, then check them together
+        matches = list(_metric_matches(mock_console))
+        loads = [float(m["bus_load"]) for m in matches if m["bus_load"] is not None]
+        rows = {}
+        for m in matches:
+            if m["id"] is not None:
+                assert m["id"] not in rows, f"Duplicate ID line for 0x{m['id']}"
+                rows[m["id"]] = (float(m["fps"]), float(m["avg_len"]), float(m["jitter"]))
+        
+        assert loads and min(loads) >= 0.0 and max(loads) <= 100.0, f"Bus load out of range: {loads}"
+        # Later (empty) windows may follow, so only the first load is compared
+        assert abs(loads[0] - expected_load) <= 0.051, f"Bus load mismatch: {loads[0]} vs {expected_load}"
+        assert rows.keys() == expected_rows.keys(), f"ID lines {sorted(rows)} vs {sorted(expected_rows)}"
+        for cid, (fps, avg_len, jitter) in rows.items():
+            expected_fps, expected_avg, expected_jitter = expected_rows[cid]
+            assert abs(fps - expected_fps) <= 0.0051, f"0x{cid} FPS mismatch: {fps} vs {expected_fps}"
+            assert abs(avg_len - expected_avg) <= 0.051, f"0x{cid} average length mismatch: {avg_len} vs {expected_avg}"
+            assert jitter >= 0, f"0x{cid} jitter should be non-negative: {jitter}ms"
+            assert abs(jitter - expected_jitter) <= 0.0051, f"0x{cid} jitter mismatch: {jitter}ms vs {expected_jitter}ms"
 
 
-class TestAnalyzerInvariantProperties:
+class TestAnalyzerInvariantProperties(_PatchedAnalyzer):
     """Test invariant properties that should always hold."""
     
-    @given(can_ids=st.lists(st.integers(min_value=0, max_value=0x7FF), min_size=1, max_size=10),
-           payload_size=st.integers(min_value=0, max_value=CAN_MAX_DLC))
-    @settings(max_examples=15, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_frame_count_never_negative(self, mock_time, mock_bus_class, mock_console_class,
-                                       can_ids, payload_size):
+    @_ANALYZE_SETTINGS
+    @given(can_ids=st.lists(_CAN_ID, min_size=1, max_size=6),
+           payload_size=_DLC)
+    @example(can_ids=[0x7FF], payload_size=CAN_MAX_DLC)
+    @example(can_ids=[0x000, 0x000], payload_size=0)
+    def test_frame_count_never_negative(self, fake_frame, time_script, can_ids, payload_size):
         """Test that frame counts are never negative."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
+        mock_console = self._fresh_mocks()
         
         # Create frames
-        frames = []
-        for can_id in can_ids:
-            frame = Mock()
-            frame.arbitration_id = can_id
-            frame.data = b'\x00' * payload_size
-            frames.append(frame)
-        
-        # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(len(frames) + 5):
-            time_values.append(start_time + i * 0.01)
-        time_values.append(start_time + 1.0)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(frames):
-                return frames[recv_call_count - 1]
-            elif recv_call_count <= len(frames) + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=1.0)
+        frames = [fake_frame(can_id, _ZERO_PAYLOAD[:payload_size]) for can_id in can_ids]
+        
+        # Generate timestamps; the first timeout after the frames closes the window
+        time_values = time_script(1000.0, 0.01, len(frames), 1001.0)
+        
+        self._set_clock(time_values)
+        self.bus = FakeBus(frames)
+        
+        analyze("test_iface", interval=1.0)
         
         # Check all counts are non-negative
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        for call in console_calls:
-            if "count=" in call:
-                parts = call.split("count=")
-                if len(parts) > 1:
-                    count_part = parts[1].split()[0]
-                    try:
-                        count = int(count_part)
-                        assert count >= 0, f"Frame count should be non-negative: {count}"
-                    except ValueError:
-                        pass
+        counts = [int(m["count"]) for m in _metric_matches(mock_console) if m["id"] is not None]
+        assert all(count >= 0 for count in counts), f"Frame counts should be non-negative: {counts}"
+        assert sum(counts) == len(frames), f"Per-ID counts {counts} should add up to {len(frames)} frames"
     
+    @_ANALYZE_SETTINGS
     @given(window_interval=st.floats(min_value=0.1, max_value=10.0),
-           bitrate=st.integers(min_value=1000, max_value=1000000))
-    @settings(max_examples=10, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_empty_window_handling_property(self, mock_time, mock_bus_class, mock_console_class,
-                                          window_interval, bitrate):
+           bitrate=_BITRATE)
+    def test_empty_window_handling_property(self, window_interval, bitrate):
         """Test that empty windows are handled gracefully."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
-        
-        # No frames, just timeouts
-        mock_bus.recv.return_value = None
+        mock_console = self._fresh_mocks()
         
         time_values = [1000.0, 1000.0 + window_interval, 1000.0 + window_interval + 0.1]
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        self._set_clock(time_values)
+        self.bus = FakeBus()
         
         # Should handle empty window without crashing
-        with patch('builtins.print'):
-            analyze("test_iface", interval=window_interval, bitrate=bitrate)
+        analyze("test_iface", interval=window_interval, bitrate=bitrate)
         
         # Should still report (even if empty)
         mock_console.print.assert_called()
     
-    def test_total_bits_calculation_property(self):
-        """Test that total bits calculation is consistent."""
-        # Test with known values
-        test_cases = [
-            (0, 47),    # Empty frame
-            (1, 55),    # 1 byte
-            (8, 111),   # Max payload
-        ]
-        
-        for payload_len, expected_bits in test_cases:
-            result = _frame_bits(payload_len)
-            assert result == expected_bits, f"Frame bits mismatch for {payload_len} bytes: {result} != {expected_bits}"
-    
-    @given(can_id=st.integers(min_value=0, max_value=0x7FF),
-           payload_len=st.integers(min_value=0, max_value=CAN_MAX_DLC),
-           count=st.integers(min_value=1, max_value=100))
-    @settings(max_examples=20, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_statistics_consistency_property(self, mock_time, mock_bus_class, mock_console_class,
-                                           can_id, payload_len, count):
+    @_ANALYZE_SETTINGS
+    @given(can_id=_CAN_ID,
+           payload_len=_DLC,
+           count=st.integers(min_value=1, max_value=10))
+    def test_statistics_consistency_property(self, fake_frame, time_script, can_id, payload_len, count):
         """Test that statistics are internally consistent."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
+        mock_console = self._fresh_mocks()
         
         # Create identical frames
-        frame = Mock()
-        frame.arbitration_id = can_id
-        frame.data = b'\x00' * payload_len
+        frame = fake_frame(can_id, _ZERO_PAYLOAD[:payload_len])
         
-        # Generate regular timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(count + 5):
-            time_values.append(start_time + i * 0.01)
-        time_values.append(start_time + 1.0)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= count:
-                return frame
-            elif recv_call_count <= count + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
-        
-        with patch('builtins.print'):
-            analyze("test_iface", interval=1.0)
+        # Generate regular timestamps; the first timeout closes the window
+        time_values = time_script(1000.0, 0.01, count, 1001.0)
+        
+        self._set_clock(time_values)
+        self.bus = FakeBus(repeat(frame, count))
+        
+        analyze("test_iface", interval=1.0)
         
         # For identical frames, average payload should equal individual payload
-        console_calls = [str(call) for call in mock_console.print.call_args_list]
-        for call in console_calls:
-            if f"ID=0x{can_id:X}" in call and "avg_len=" in call:
-                parts = call.split("avg_len=")
-                if len(parts) > 1:
-                    avg_part = parts[1].split()[0]
-                    try:
-                        avg_len = float(avg_part)
-                        # Should equal the payload length
-                        assert abs(avg_len - payload_len) < 0.1, \
-                            f"Average length inconsistent: {avg_len} vs {payload_len}"
-                    except ValueError:
-                        pass
+        avg_lens = [float(m["avg_len"]) for m in _metric_matches(mock_console) if m["id"] == f"{can_id:X}"]
+        assert avg_lens, "Window report should include the frame's ID line"
+        # Should equal the payload length
+        assert max(abs(avg_len - payload_len) for avg_len in avg_lens) < 0.1, \
+            f"Average length inconsistent: {avg_lens} vs {payload_len}"
 
 
-class TestAnalyzerRobustnessProperties:
+class TestAnalyzerRobustnessProperties(_PatchedAnalyzer):
     """Test robustness properties under various conditions."""
     
-    @given(valid_payloads=st.lists(st.integers(min_value=0, max_value=CAN_MAX_DLC), min_size=1, max_size=10),
-           invalid_payloads=st.lists(st.integers(min_value=CAN_MAX_DLC + 1, max_value=20), min_size=1, max_size=5))
-    @settings(max_examples=10, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_mixed_valid_invalid_dlc_property(self, mock_time, mock_bus_class, mock_console_class,
-                                             valid_payloads, invalid_payloads):
+    @_ANALYZE_SETTINGS
+    @given(valid_payloads=st.lists(_DLC, min_size=1, max_size=6),
+           invalid_payloads=st.lists(_INVALID_DLC, min_size=1, max_size=5))
+    @example(valid_payloads=[CAN_MAX_DLC], invalid_payloads=[CAN_MAX_DLC + 1])
+    def test_mixed_valid_invalid_dlc_property(self, fake_frame, time_script, valid_payloads, invalid_payloads):
         """Test handling of mixed valid and invalid DLC frames."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
+        mock_console = self._fresh_mocks()
         
         # Create mixed frames
-        frames = []
         can_id = 0x123
-        
-        # Valid frames
-        for payload_len in valid_payloads:
-            frame = Mock()
-            frame.arbitration_id = can_id
-            frame.data = b'\x00' * payload_len
-            frames.append(frame)
-        
-        # Invalid frames (will trigger warnings)
-        for payload_len in invalid_payloads:
-            frame = Mock()
-            frame.arbitration_id = can_id + 1
-            frame.data = b'\x00' * payload_len
-            frames.append(frame)
+        frames = [
+            # Valid frames
+            *(fake_frame(can_id, _ZERO_PAYLOAD[:n]) for n in valid_payloads),
+            # Invalid frames (will trigger warnings)
+            *(fake_frame(can_id + 1, _ZERO_PAYLOAD[:n]) for n in invalid_payloads),
+        ]
         
         # Generate timestamps to ensure window reporting triggers
-        start_time = 1000.0
-        time_values = [start_time]  # window_start
-        for i in range(len(frames) + 2):
-            time_values.append(start_time + i * 0.01)  # Frame timestamps
-        time_values.append(start_time + 1.1)  # Cross interval threshold
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(frames):
-                return frames[recv_call_count - 1]
-            elif recv_call_count <= len(frames) + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        # window_start, frame timestamps, then cross the interval threshold
+        time_values = time_script(1000.0, 0.01, len(frames) + 2, 1001.1)
+        
+        self._set_clock(time_values)
+        self.bus = FakeBus(frames)
         
         # Should handle mixed frames without crashing
-        with patch('builtins.print') as mock_print:
-            analyze("test_iface", interval=1.0)
+        analyze("test_iface", interval=1.0)
         
         # Should report some statistics for valid frames
         mock_console.print.assert_called()
         
         # Should warn about invalid DLC
-        warning_calls = [str(call) for call in mock_print.call_args_list]
-        warning_found = any("Warning" in call for call in warning_calls)
+        warning_found = any("Warning" in line for line in self.printed)
         if invalid_payloads:  # Only expect warnings if there were invalid payloads
             assert warning_found, "Should warn about invalid DLC"
     
+    @_ANALYZE_SETTINGS
     @given(window_size=st.floats(min_value=0.001, max_value=0.1),  # Very small windows
            frame_count=st.integers(min_value=1, max_value=10))
-    @settings(max_examples=10, deadline=3000)
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_tiny_window_robustness_property(self, mock_time, mock_bus_class, mock_console_class,
-                                            window_size, frame_count):
+    def test_tiny_window_robustness_property(self, fake_frame, time_script, window_size, frame_count):
         """Test robustness with very small time windows."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
-        mock_console = Mock()
-        mock_console_class.return_value = mock_console
+        mock_console = self._fresh_mocks()
         
         # Create frame
-        frame = Mock()
-        frame.arbitration_id = 0x100
-        frame.data = b'\x01\x02'
+        frame = fake_frame(0x100, b'\x01\x02')
         
         # Generate timestamps for tiny window - ensure we cross the interval
         start_time = 1000.0
-        time_values = [start_time]  # window_start
-        for i in range(frame_count + 2):
-            time_values.append(start_time + i * (window_size / (frame_count + 5)))
-        time_values.append(start_time + window_size + 0.001)  # Definitely cross interval
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= frame_count:
-                return frame
-            elif recv_call_count <= frame_count + 3:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        time_values = time_script(start_time, window_size / (frame_count + 5), frame_count + 2,
+                                  start_time + window_size + 0.001)  # Definitely cross interval
+        
+        self._set_clock(time_values)
+        self.bus = FakeBus(repeat(frame, frame_count))
         
         # Should handle tiny windows without numerical issues
-        with patch('builtins.print'):
-            analyze("test_iface", interval=window_size)
+        analyze("test_iface", interval=window_size)
         
         # Should still report (even for tiny windows)
         mock_console.print.assert_called()
\ No newline at end of file
@@ -14,33 +14,99 @@ Tests extreme conditions and edge cases including:
 - Concurrent operations stress
 """
 
+import faulthandler
+import io
 import pytest
+import random
 import time
 import tempfile
 import os
 import threading
+from contextlib import ExitStack, redirect_stdout
+from itertools import chain, count, cycle, islice, repeat
 from unittest.mock import Mock, patch
 from socketcan_sa.analyzer import analyze, _frame_bits, CAN_MAX_DLC
 
+# Two laps of every byte value, so any 3-byte window ``_BYTE_RING[k:k + 3]``
+# with k < 256 is a zero-setup payload of consecutive (mod 256) bytes.
+_BYTE_RING = bytes(range(256)) * 2
+
+# Fill-pattern pools for the payload-size sweep: valid sizes slice _FF32,
+# oversized (invalid DLC) ones slice _AA32.
+_FF32 = b'\xFF' * 32
+_AA32 = b'\xAA' * 32
+
+
+class _StubBus:
+    """
+    Minimal bus without Mock call recording.
+
+    recv() replays ``script``, raising any exception instance found in it, and
+    raises KeyboardInterrupt once the script is exhausted.
+    """
+
+    def __init__(self, script):
+        self._script = iter(script)
+        self.recv_calls = 0
+        self.shutdown_calls = 0
+
+    def recv(self, timeout=None):
+        self.recv_calls += 1
+        for msg in self._script:
+            if isinstance(msg, BaseException):
+                raise msg
+            return msg
+        raise KeyboardInterrupt
+
+    def shutdown(self):
+        self.shutdown_calls += 1
+
+
+def _install_driver(mock_time, mock_bus_class, time_values, frames, n_none=5):
+    """
+    Script time.time() and the CAN bus for one analyze() run.
+
+    time.time() replays ``time_values`` then holds one second past the last
+    value; the bus yields ``frames``, then ``n_none`` timeouts, then
+    KeyboardInterrupt. Returns the installed bus.
+    """
+    mock_time.side_effect = chain(time_values, repeat(time_values[-1] + 1.0))
+    bus = mock_bus_class.return_value = _StubBus(chain(frames, [None] * n_none))
+    return bus
+
+
+def _printed_text(mock_console):
+    """Return the first positional argument of each console.print() call as a string."""
+    return [str(c.args[0]) if c.args else "" for c in mock_console.print.call_args_list]
+
+
+@pytest.fixture
+def analyzer_env():
+    """Patch time.time, the CAN bus class and the rich Console in one go."""
+    with ExitStack() as stack:
+        mock_time = stack.enter_context(patch('time.time'))
+        mock_bus_class = stack.enter_context(patch('can.interface.Bus'))
+        mock_console_class = stack.enter_context(patch('socketcan_sa.analyzer.Console'))
+        yield mock_time, mock_bus_class, mock_console_class
+
+
+def setup_module(module):
+    """Dump tracebacks on hard crashes or hangs in the long-running stress tests."""
+    faulthandler.enable()
+
 
-@pytest.mark.timeout(60)  # Longer timeout for stress tests
 class TestAnalyzerStress:
     """Stress tests for analyzer under extreme conditions."""
     
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_high_frequency_burst_traffic(self, mock_time, mock_bus_class, mock_console_class):
+    @pytest.mark.timeout(30)
+    def test_high_frequency_burst_traffic(self, analyzer_env, fake_frame, time_script):
         """Test analyzer under high-frequency burst traffic (1000+ fps)."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create burst traffic
-        burst_frame = Mock()
-        burst_frame.arbitration_id = 0x200
-        burst_frame.data = b'\x01\x02\x03\x04\x05'
+        burst_frame = fake_frame(0x200, b'\x01\x02\x03\x04\x05')
         
         # Simulate 1000+ frames in short burst
         num_frames = 1000
@@ -48,43 +114,18 @@ class TestAnalyzerStress:
         
         # Generate timestamps for burst
         start_time = 1000.0
-        time_values = [start_time]
-        for i in range(num_frames):
-            time_values.append(start_time + i * (burst_duration / num_frames))
-        time_values.append(start_time + burst_duration)
-        time_values.append(start_time + 1.0)  # Window end
-        time_values.append(start_time + 1.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= num_frames:
-                return burst_frame
-            elif recv_call_count <= num_frames + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        time_values = time_script(start_time, burst_duration / num_frames, num_frames,
+                                  start_time + burst_duration,
+                                  start_time + 1.0,  # Window end
+                                  start_time + 1.1)
         
-        # Should handle burst traffic without issues
-        start_real_time = time.perf_counter()
+        _install_driver(mock_time, mock_bus_class, time_values, repeat(burst_frame, num_frames))
         
-        with patch('builtins.print'):
+        # Should handle burst traffic without issues
+        with redirect_stdout(io.StringIO()):
+            start_real_time = time.perf_counter()
             analyze("test_iface", interval=1.0)
-        
-        end_real_time = time.perf_counter()
+            end_real_time = time.perf_counter()
         execution_time = end_real_time - start_real_time
         
         # Should complete in reasonable time despite high load
@@ -93,87 +134,45 @@ class TestAnalyzerStress:
         # Should report statistics
         mock_console.print.assert_called()
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_massive_can_id_diversity(self, mock_time, mock_bus_class, mock_console_class):
+    @pytest.mark.timeout(30)
+    def test_massive_can_id_diversity(self, analyzer_env, fake_frame, time_script):
         """Test analyzer with massive CAN ID diversity (500+ unique IDs)."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create frames with many unique IDs
         num_unique_ids = 500
-        frames = []
-        for i in range(num_unique_ids):
-            frame = Mock()
-            frame.arbitration_id = 0x100 + i
-            frame.data = bytes([i % 256, (i + 1) % 256, (i + 2) % 256])
-            frames.append(frame)
+        frames = [fake_frame(0x100 + i, _BYTE_RING[i % 256:i % 256 + 3]) for i in range(num_unique_ids)]
         
         # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(num_unique_ids * 2):  # Send each ID twice
-            time_values.append(start_time + i * 0.001)  # 1ms intervals
-        time_values.append(start_time + 1.0)
-        time_values.append(start_time + 1.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= num_unique_ids * 2:
-                return frames[(recv_call_count - 1) % num_unique_ids]
-            elif recv_call_count <= num_unique_ids * 2 + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        # Send each ID twice at 1ms intervals
+        time_values = time_script(1000.0, 0.001, num_unique_ids * 2, 1001.0, 1001.1)
         
-        # Should handle massive ID diversity
-        start_real_time = time.perf_counter()
+        _install_driver(mock_time, mock_bus_class, time_values, islice(cycle(frames), num_unique_ids * 2))
         
-        with patch('builtins.print'):
+        # Should handle massive ID diversity
+        with redirect_stdout(io.StringIO()):
+            start_real_time = time.perf_counter()
             analyze("test_iface", interval=1.0)
-        
-        end_real_time = time.perf_counter()
+            end_real_time = time.perf_counter()
         execution_time = end_real_time - start_real_time
         
         # Should complete in reasonable time
         assert execution_time < 45.0, f"Massive ID diversity took too long: {execution_time:.2f}s"
         
         # Should report statistics for multiple IDs
-        mock_console.print.assert_called()
-        console_calls = mock_console.print.call_args_list
-        assert len(console_calls) > 10, "Should report statistics for many IDs"
+        assert mock_console.print.call_count > 10, "Should report statistics for many IDs"
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_marathon_analysis_session(self, mock_time, mock_bus_class, mock_console_class):
+    @pytest.mark.timeout(60)
+    def test_marathon_analysis_session(self, analyzer_env, fake_frame, window_grid):
         """Test analyzer for extended duration (simulated marathon session)."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create frame for long session
-        marathon_frame = Mock()
-        marathon_frame.arbitration_id = 0x300
-        marathon_frame.data = b'\x01\x02\x03'
+        marathon_frame = fake_frame(0x300, b'\x01\x02\x03')
         
         # Simulate many windows (equivalent to long session)
         num_windows = 50
@@ -182,141 +181,67 @@ class TestAnalyzerStress:
         
         # Generate timestamps for many windows
         start_time = 1000.0
-        time_values = [start_time]
-        
-        for window in range(num_windows):
-            window_start = start_time + window * 1.0
-            for frame in range(frames_per_window):
-                time_values.append(window_start + frame * 0.05)
-            time_values.append(window_start + 1.0)  # Window boundary
-        
-        time_values.append(start_time + num_windows + 1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= total_frames:
-                return marathon_frame
-            elif recv_call_count <= total_frames + 10:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        time_values = [start_time,
+                       *window_grid(start_time, num_windows, 1.0, frames_per_window, 0.05),
+                       start_time + num_windows + 1]
         
-        # Should handle marathon session
-        start_real_time = time.perf_counter()
+        _install_driver(mock_time, mock_bus_class, time_values, repeat(marathon_frame, total_frames), n_none=10)
         
-        with patch('builtins.print'):
+        # Should handle marathon session
+        with redirect_stdout(io.StringIO()):
+            start_real_time = time.perf_counter()
             analyze("test_iface", interval=1.0)
-        
-        end_real_time = time.perf_counter()
+            end_real_time = time.perf_counter()
         execution_time = end_real_time - start_real_time
         
         # Should complete marathon session
         assert execution_time < 60.0, f"Marathon session took too long: {execution_time:.2f}s"
         
         # Should have many window reports (looking for actual console output format)
-        console_calls = mock_console.print.call_args_list
-        window_reports = len([call for call in console_calls if "window=" in str(call) or "bus_load≈" in str(call)])
+        window_reports = sum("window=" in line or "bus_load≈" in line for line in _printed_text(mock_console))
         assert window_reports >= 20, f"Expected many window reports, got {window_reports}"
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_extreme_payload_variations(self, mock_time, mock_bus_class, mock_console_class):
+    def test_extreme_payload_variations(self, analyzer_env, fake_frame, time_script):
         """Test analyzer with extreme payload size variations."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create frames with all possible payload sizes + invalid ones
-        frames = []
         can_id_base = 0x400
         
         # Valid payloads (0-8 bytes)
-        for size in range(CAN_MAX_DLC + 1):
-            frame = Mock()
-            frame.arbitration_id = can_id_base + size
-            frame.data = b'\xFF' * size
-            frames.append(frame)
+        frames = [fake_frame(can_id_base + size, _FF32[:size]) for size in range(CAN_MAX_DLC + 1)]
         
         # Invalid payloads (will trigger warnings)
-        for size in [9, 10, 15, 20]:
-            frame = Mock()
-            frame.arbitration_id = can_id_base + 100 + size
-            frame.data = b'\xAA' * size
-            frames.append(frame)
+        frames += [fake_frame(can_id_base + 100 + size, _AA32[:size]) for size in (9, 10, 15, 20)]
         
         # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(len(frames) * 5):  # Send each frame multiple times
-            time_values.append(start_time + i * 0.01)
-        time_values.append(start_time + 1.0)
-        time_values.append(start_time + 1.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(frames) * 5:
-                return frames[(recv_call_count - 1) % len(frames)]
-            elif recv_call_count <= len(frames) * 5 + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        # Send each frame multiple times
+        time_values = time_script(1000.0, 0.01, len(frames) * 5, 1001.0, 1001.1)
+        
+        _install_driver(mock_time, mock_bus_class, time_values, islice(cycle(frames), len(frames) * 5))
         
         # Should handle extreme payload variations
-        with patch('builtins.print') as mock_print:
+        with redirect_stdout(io.StringIO()) as out:
             analyze("test_iface", interval=1.0)
         
         # Should report statistics for valid frames
         mock_console.print.assert_called()
         
         # Should warn about invalid payloads
-        warning_calls = [str(call) for call in mock_print.call_args_list]
-        warning_found = any("Warning" in call for call in warning_calls)
+        warning_found = "Warning" in out.getvalue()
         assert warning_found, "Should warn about invalid DLC"
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_rapid_window_transitions(self, mock_time, mock_bus_class, mock_console_class):
+    @pytest.mark.timeout(5)
+    def test_rapid_window_transitions(self, analyzer_env, fake_frame, window_grid):
         """Test analyzer with very rapid window transitions."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create frame
-        transition_frame = Mock()
-        transition_frame.arbitration_id = 0x500
-        transition_frame.data = b'\x01\x02'
+        transition_frame = fake_frame(0x500, b'\x01\x02')
         
         # Very small windows for rapid transitions
         window_size = 0.1  # 100ms windows
@@ -325,61 +250,29 @@ class TestAnalyzerStress:
         
         # Generate timestamps for rapid windows
         start_time = 1000.0
-        time_values = [start_time]
-        
-        for window in range(num_windows):
-            window_start = start_time + window * window_size
-            for frame in range(frames_per_window):
-                time_values.append(window_start + frame * (window_size / frames_per_window))
-            time_values.append(window_start + window_size)  # Window boundary
-        
-        time_values.append(start_time + num_windows * window_size + 0.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= num_windows * frames_per_window:
-                return transition_frame
-            elif recv_call_count <= num_windows * frames_per_window + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        time_values = [start_time,
+                       *window_grid(start_time, num_windows, window_size,
+                                     frames_per_window, window_size / frames_per_window),
+                       start_time + num_windows * window_size + 0.1]
+        
+        _install_driver(mock_time, mock_bus_class, time_values, repeat(transition_frame, num_windows * frames_per_window))
         
         # Should handle rapid window transitions
-        with patch('builtins.print'):
+        with redirect_stdout(io.StringIO()):
             analyze("test_iface", interval=window_size)
         
         # Should report for multiple windows
-        console_calls = mock_console.print.call_args_list
-        assert len(console_calls) >= 15, "Should have many rapid window reports"
+        assert mock_console.print.call_count >= 15, "Should have many rapid window reports"
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_csv_file_stress_large_output(self, mock_time, mock_bus_class, mock_console_class):
+    @pytest.mark.timeout(60)
+    def test_csv_file_stress_large_output(self, analyzer_env, fake_frame, window_grid):
         """Test CSV file handling under stress with large output."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create frame for CSV stress
-        csv_frame = Mock()
-        csv_frame.arbitration_id = 0x600
-        csv_frame.data = b'\x01\x02\x03\x04\x05\x06\x07\x08'
+        csv_frame = fake_frame(0x600, b'\x01\x02\x03\x04\x05\x06\x07\x08')
         
         # Generate many windows for large CSV
         num_windows = 100
@@ -387,284 +280,163 @@ class TestAnalyzerStress:
         
         # Generate timestamps
         start_time = 1000.0
-        time_values = [start_time]
-        
-        for window in range(num_windows):
-            window_start = start_time + window * 1.0
-            for frame in range(frames_per_window):
-                time_values.append(window_start + frame * 0.1)
-            time_values.append(window_start + 1.0)
-        
-        time_values.append(start_time + num_windows + 1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= num_windows * frames_per_window:
-                return csv_frame
-            elif recv_call_count <= num_windows * frames_per_window + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        time_values = [start_time,
+                       *window_grid(start_time, num_windows, 1.0, frames_per_window, 0.1),
+                       start_time + num_windows + 1]
+        
+        _install_driver(mock_time, mock_bus_class, time_values, repeat(csv_frame, num_windows * frames_per_window))
         
         # Use temporary file for large CSV
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as temp_file:
-            csv_path = temp_file.name
+        fd, csv_path = tempfile.mkstemp(suffix='.csv')
+        os.close(fd)
         
         try:
             # Should handle large CSV output
-            with patch('builtins.print'):
+            with redirect_stdout(io.StringIO()):
                 analyze("test_iface", interval=1.0, csv_path=csv_path)
             
-            # Verify large CSV was created
-            assert os.path.exists(csv_path), "Large CSV file should be created"
-            
-            with open(csv_path, 'r') as f:
-                lines = f.readlines()
-            
-            # Should have many rows
-            assert len(lines) >= 50, f"Large CSV should have many rows, got {len(lines)}"
-            
             # File should be substantial size
             file_size = os.path.getsize(csv_path)
             assert file_size > 1000, f"CSV file should be substantial, got {file_size} bytes"
             
+            with open(csv_path, 'rb') as f:
+                num_lines = f.read().count(b'\n')
+            
+            # Should have many rows
+            assert num_lines >= 50, f"Large CSV should have many rows, got {num_lines}"
+            
         finally:
             if os.path.exists(csv_path):
                 os.unlink(csv_path)
                 
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_mixed_error_conditions_under_load(self, mock_time, mock_bus_class, mock_console_class):
+    def test_mixed_error_conditions_under_load(self, analyzer_env, fake_frame, time_script):
         """Test analyzer handling mixed error conditions under high load."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create mix of valid and invalid frames
-        valid_frame = Mock()
-        valid_frame.arbitration_id = 0x700
-        valid_frame.data = b'\x01\x02\x03'
+        valid_frame = fake_frame(0x700, b'\x01\x02\x03')
         
-        invalid_frame = Mock()
-        invalid_frame.arbitration_id = 0x701
-        invalid_frame.data = b'\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0A'  # Too long
+        invalid_frame = fake_frame(0x701, b'\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0A')  # Too long
         
         # Generate mixed load
         num_cycles = 200
         
-        time_values = [1000.0]
-        for i in range(num_cycles + 10):
-            time_values.append(1000.0 + i * 0.005)  # 200fps
-        time_values.append(1001.0)
-        time_values.append(1001.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= num_cycles:
-                # Mix valid and invalid frames
-                if recv_call_count % 3 == 0:
-                    return invalid_frame  # Every 3rd frame is invalid
-                else:
-                    return valid_frame
-            elif recv_call_count <= num_cycles + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        time_values = time_script(1000.0, 0.005, num_cycles + 10, 1001.0, 1001.1)  # 200fps
+        
+        # Mix valid and invalid frames: every 3rd frame is invalid
+        mixed_frames = islice(cycle([valid_frame, valid_frame, invalid_frame]), num_cycles)
+        _install_driver(mock_time, mock_bus_class, time_values, mixed_frames)
         
         # Should handle mixed errors under load
-        with patch('builtins.print') as mock_print:
+        with redirect_stdout(io.StringIO()) as out:
             analyze("test_iface", interval=1.0)
         
         # Should report statistics for valid frames
         mock_console.print.assert_called()
         
         # Should warn about invalid frames
-        warning_calls = [str(call) for call in mock_print.call_args_list]
-        warning_count = sum(1 for call in warning_calls if "Warning" in call)
+        warning_count = out.getvalue().count("Warning")
         expected_warnings = num_cycles // 3  # Every 3rd frame
         assert warning_count >= expected_warnings // 2, f"Expected warnings for invalid frames: {warning_count} >= {expected_warnings // 2}"
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_interrupt_signal_stress_during_analysis(self, mock_time, mock_bus_class, mock_console_class):
+    def test_interrupt_signal_stress_during_analysis(self, analyzer_env, fake_frame):
         """Test interrupt signal handling during intensive analysis."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create frame for stress
-        stress_frame = Mock()
-        stress_frame.arbitration_id = 0x800
-        stress_frame.data = b'\x01\x02\x03\x04'
+        stress_frame = fake_frame(0x800, b'\x01\x02\x03\x04')
         
         # Set up timing with realistic values to avoid recursion
         start_time = 1000.0
-        time_call_count = 0
-        
-        def time_side_effect():
-            nonlocal time_call_count
-            time_call_count += 1
-            return start_time + time_call_count * 0.01
-        
-        # Counter for controlling when to interrupt
-        recv_call_count = 0
-        interrupt_after = 100  # Interrupt after processing some frames
-        
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            
-            if recv_call_count <= interrupt_after:
-                return stress_frame
-            elif recv_call_count <= interrupt_after + 10:
-                return None  # Some timeouts
-            else:
-                # Simulate interrupt during intensive processing
-                raise KeyboardInterrupt("Simulated interrupt during stress")
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        mock_time.side_effect = (start_time + i * 0.01 for i in count(1))
+        
+        # Interrupt after processing some frames and a few timeouts
+        interrupt_after = 100
+        bus = _StubBus(chain(
+            repeat(stress_frame, interrupt_after),
+            [None] * 10,
+            # Simulate interrupt during intensive processing
+            [KeyboardInterrupt("Simulated interrupt during stress")],
+        ))
+        mock_bus_class.return_value = bus
         
         # Should handle interrupt gracefully even under stress
-        with patch('builtins.print'):
+        with redirect_stdout(io.StringIO()):
             analyze("test_iface", interval=1.0)
         
         # Should have attempted to shutdown cleanly
-        mock_bus.shutdown.assert_called_once()
+        assert bus.shutdown_calls == 1
         
         # Should have processed some frames before interrupt
-        assert recv_call_count >= interrupt_after, "Should process frames before interrupt"
+        assert bus.recv_calls >= interrupt_after, "Should process frames before interrupt"
         
+    @pytest.mark.timeout(5)
     def test_frame_bits_stress_extreme_values(self):
         """Test frame bits calculation under stress with extreme values."""
+        # Sanity-check every payload size once, outside the timed region
+        for payload_size in range(CAN_MAX_DLC + 1):
+            result = _frame_bits(payload_size)
+            assert 0 < result < 200, f"Frame bits out of range for size {payload_size}: {result}"
+        
         # Test with all valid payload sizes rapidly
         test_iterations = 10000
+        sizes = range(CAN_MAX_DLC + 1)
         
         start_time = time.perf_counter()
         
-        for iteration in range(test_iterations):
-            for payload_size in range(CAN_MAX_DLC + 1):
-                result = _frame_bits(payload_size)
-                
-                # Basic sanity checks under stress
-                assert result > 0, f"Frame bits should be positive at iteration {iteration}, size {payload_size}"
-                assert result < 200, f"Frame bits too large at iteration {iteration}, size {payload_size}: {result}"
+        for _ in range(test_iterations):
+            for payload_size in sizes:
+                _frame_bits(payload_size)
         
         end_time = time.perf_counter()
         execution_time = end_time - start_time
         
         # Should complete stress test quickly
-        assert execution_time < 2.0, f"Frame bits stress test took too long: {execution_time:.3f}s"
+        assert execution_time < 0.5, f"Frame bits stress test took too long: {execution_time:.3f}s"
         
         # Calculate throughput
         total_calculations = test_iterations * (CAN_MAX_DLC + 1)
         calculations_per_sec = total_calculations / execution_time
         
         # Should maintain high throughput under stress
-        assert calculations_per_sec > 50000, f"Frame bits calculation too slow under stress: {calculations_per_sec:.0f} calc/sec"
+        assert calculations_per_sec > 500000, f"Frame bits calculation too slow under stress: {calculations_per_sec:.0f} calc/sec"
         
-    @patch('socketcan_sa.analyzer.Console')
-    @patch('can.interface.Bus')
-    @patch('time.time')
-    def test_concurrent_statistics_calculation_stress(self, mock_time, mock_bus_class, mock_console_class):
+    def test_concurrent_statistics_calculation_stress(self, analyzer_env, fake_frame, time_script):
         """Test statistics calculation under concurrent-like stress conditions."""
-        mock_bus = Mock()
-        mock_bus_class.return_value = mock_bus
+        mock_time, mock_bus_class, mock_console_class = analyzer_env
         mock_console = Mock()
         mock_console_class.return_value = mock_console
         
         # Create many frames with different IDs for concurrent-like processing
         num_concurrent_ids = 100
         frames_per_id = 20
-        frames = []
-        
-        for can_id in range(num_concurrent_ids):
-            for frame_num in range(frames_per_id):
-                frame = Mock()
-                frame.arbitration_id = 0x100 + can_id
-                frame.data = bytes([can_id % 256, frame_num % 256, (can_id + frame_num) % 256])
-                frames.append(frame)
+        # Both counters stay below 128, so every payload byte fits without wrapping
+        frames = [fake_frame(0x100 + can_id, bytes((can_id, frame_num, can_id + frame_num)))
+                  for can_id in range(num_concurrent_ids)
+                  for frame_num in range(frames_per_id)]
         
-        # Shuffle frames to simulate concurrent arrival
-        import random
-        random.shuffle(frames)
+        # Shuffle frames to simulate concurrent arrival (seeded for reproducibility)
+        random.Random(0).shuffle(frames)
         
         # Generate timestamps
-        start_time = 1000.0
-        time_values = [start_time]
-        for i in range(len(frames) + 10):
-            time_values.append(start_time + i * 0.001)  # 1000fps
-        time_values.append(start_time + 2.0)
-        time_values.append(start_time + 2.1)
-        
-        time_call_count = 0
-        def time_side_effect():
-            nonlocal time_call_count
-            if time_call_count < len(time_values):
-                result = time_values[time_call_count]
-                time_call_count += 1
-                return result
-            return time_values[-1] + 1.0
-        
-        recv_call_count = 0
-        def recv_side_effect(timeout=None):
-            nonlocal recv_call_count
-            recv_call_count += 1
-            if recv_call_count <= len(frames):
-                return frames[recv_call_count - 1]
-            elif recv_call_count <= len(frames) + 5:
-                return None
-            else:
-                raise KeyboardInterrupt()
-        
-        mock_time.side_effect = time_side_effect
-        mock_bus.recv.side_effect = recv_side_effect
+        time_values = time_script(1000.0, 0.001, len(frames) + 10, 1002.0, 1002.1)  # 1000fps
         
-        # Should handle concurrent-like statistics calculation
-        start_real_time = time.perf_counter()
+        _install_driver(mock_time, mock_bus_class, time_values, frames)
         
-        with patch('builtins.print'):
+        # Should handle concurrent-like statistics calculation
+        with redirect_stdout(io.StringIO()):
+            start_real_time = time.perf_counter()
             analyze("test_iface", interval=2.0)  # Longer window to capture all
-        
-        end_real_time = time.perf_counter()
+            end_real_time = time.perf_counter()
         execution_time = end_real_time - start_real_time
         
         # Should complete concurrent stress test
         assert execution_time < 30.0, f"Concurrent stress test took too long: {execution_time:.2f}s"
         
         # Should report statistics for many IDs
-        console_calls = mock_console.print.call_args_list
-        id_reports = [call for call in console_calls if "ID=" in str(call)]
-        assert len(id_reports) >= 50, f"Expected statistics for many IDs, got {len(id_reports)}"
+        id_reports = sum("ID=" in line for line in _printed_text(mock_console))
+        assert id_reports >= 50, f"Expected statistics for many IDs, got {id_reports}"
@@ -7,20 +7,165 @@ for the YAML rules parser and CAN ID validation.
 """
 
 import pytest
-import tempfile
 import os
-import textwrap
 from unittest.mock import Mock, patch, mock_open
-from socketcan_sa.rules import load_rules, RuleError, _parse_can_id, MAX_CAN_ID
+from socketcan_sa.rules import load_rules, load_rules_from_string, validate_rules, RuleError, _parse_can_id, MAX_CAN_ID
 
 
-def _write_tmp(yaml_text: str) -> str:
-    """Helper to write temporary YAML file."""
-    fd, path = tempfile.mkstemp(suffix=".yaml")
-    os.close(fd)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(textwrap.dedent(yaml_text))
-    return path
+def _assert_rule_error(yaml_text: str, pattern: str) -> None:
+    """Assert that parsing ``yaml_text`` raises RuleError matching ``pattern``."""
+    with pytest.raises(RuleError, match=pattern):
+        load_rules_from_string(yaml_text)
+
+
+def _assert_invalid_doc(doc: dict, pattern: str) -> None:
+    """Assert that validating an already-parsed ``doc`` raises RuleError matching ``pattern``."""
+    with pytest.raises(RuleError, match=pattern):
+        validate_rules(doc)
+
+
+# Multi-line YAML fixtures, written flush-left so no dedent is needed at test time
+_YAML_MALFORMED = """\
+limits:
+  "0x123": { rate: 10
+# Missing closing brace - invalid YAML
+"""
+
+_YAML_NULL_SECTIONS = """\
+limits: null
+actions: null
+"""
+
+_YAML_DEFAULT_BURSTS = """\
+limits:
+  "0x123": { rate: 10.7 }    # Should ceil to 11
+  "0x456": { rate: 5.0 }     # Should be 5
+  "0x789": { rate: 1.1 }     # Should ceil to 2
+"""
+
+_YAML_MIXED_ID_FORMATS = """\
+limits:
+  "0x100": { rate: 10 }      # Hex string
+  256: { rate: 20 }          # Decimal int
+  "0X101": { rate: 30 }      # Uppercase hex
+  "258": { rate: 40 }        # Decimal string
+actions:
+  drop: ["0x200", 513, "0X202", "515"]
+  remap:
+    - { from: "0x300", to: 769 }     # Hex to decimal
+    - { from: 770, to: "0x303" }     # Decimal to hex
+"""
+
+_YAML_UNICODE_COMMENTS = """\
+# Comments with üñíçødé characters
+limits:
+  "0x123": { rate: 10 }  # Comment with émojis 🚗💨
+actions:
+  drop: ["0x456"]        # More ünîcødé
+"""
+
+
+BOUNDARY_CAN_IDS = [
+    # Minimum valid ID
+    (0, 0),
+    ("0", 0),
+    ("0x0", 0),
+    # Maximum 11-bit ID (standard CAN)
+    (0x7FF, 0x7FF),
+    ("2047", 0x7FF),
+    ("0x7FF", 0x7FF),
+    # Maximum 29-bit ID (extended CAN)
+    (MAX_CAN_ID, MAX_CAN_ID),
+    ("0x1FFFFFFF", MAX_CAN_ID),
+]
+
+CAN_ID_FORMAT_VARIATIONS = [
+    ("0x123", 0x123),
+    ("0X123", 0x123),  # Uppercase X
+    ("0x0123", 0x123),  # Leading zeros
+    ("123", 123),
+    ("  123  ", 123),  # Whitespace
+    ("12_3", 123),     # Underscores (should be removed)
+]
+
+INVALID_CAN_ID_FORMATS = [
+    (None, "must be int or hex/dec string"),
+    ([], "must be int or hex/dec string"),
+    ({}, "must be int or hex/dec string"),
+    (3.14, "must be int or hex/dec string"),
+    ("", "invalid CAN ID format"),
+    ("0x", "invalid CAN ID format"),
+    ("xyz", "invalid CAN ID format"),
+    ("0xGHI", "invalid CAN ID format"),
+    ("12.34", "invalid CAN ID format"),
+    ("0b1010", "invalid CAN ID format"),  # Binary not supported
+]
+
+OUT_OF_RANGE_CAN_IDS = [
+    -1,
+    -100,
+    "0x20000000",  # Just above MAX_CAN_ID
+    "0x30000000",
+    MAX_CAN_ID + 1,
+    "999999999",   # Large decimal
+]
+
+INVALID_LIMITS_SECTIONS = [
+    ([], "must be a mapping"),
+    ("string", "must be a mapping"),
+    (123, "must be a mapping"),
+    (None, "must be a mapping"),
+]
+
+INVALID_LIMIT_CONFIGS = [
+    ("not a dict", "value must be a mapping"),
+    ([], "value must be a mapping"),
+    (123, "value must be a mapping"),
+    (None, "value must be a mapping"),
+]
+
+INVALID_RATES = [
+    (0, "must be > 0"),
+    (-1, "must be > 0"),
+    (-0.5, "must be > 0"),
+    ("not_a_number", "must be > 0"),
+    (None, "must be > 0"),
+    ([], "must be > 0"),
+]
+
+INVALID_BURSTS = [
+    (0, "must be >= 1"),
+    (-1, "must be >= 1"),
+    (0.5, "must be >= 1"),  # Float burst not allowed
+    ("5", "must be >= 1"),  # String not allowed
+    ("None", "must be >= 1"),  # Not YAML null: a plain None means "use the default"
+]
+
+INVALID_ACTIONS_SECTIONS = [
+    ([], "must be a mapping"),
+    ("string", "must be a mapping"),
+    (123, "must be a mapping"),
+]
+
+INVALID_DROP_LISTS = [
+    ("not a list", "must be a list"),
+    (123, "must be a list"),
+    ({}, "must be a list"),
+]
+
+INVALID_REMAP_LISTS = [
+    ("not a list", "must be a list"),
+    (123, "must be a list"),
+    ({}, "must be a list"),
+]
+
+INVALID_REMAP_ITEMS = [
+    ("not a dict", "each item must be"),
+    (123, "each item must be"),
+    ({}, "each item must be"),  # Missing from/to
+    ({"from": "0x123"}, "each item must be"),  # Missing to
+    ({"to": "0x123"}, "each item must be"),    # Missing from
+]
 
 
 class TestErrorHandling:
@@ -39,325 +184,129 @@ class TestErrorHandling:
 
     def test_malformed_yaml_syntax(self):
         """Test handling of malformed YAML syntax."""
-        path = _write_tmp("""
-        limits:
-          "0x123": { rate: 10
-        # Missing closing brace - invalid YAML
-        """)
-        try:
-            with pytest.raises(RuleError, match="Failed to load rules"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        _assert_rule_error(_YAML_MALFORMED, "Failed to load rules")
 
     def test_yaml_with_tabs_and_mixed_indentation(self):
         """Test handling of YAML with problematic whitespace."""
         # YAML doesn't allow tabs for indentation - should raise error
         content = "limits:\n\t'0x123': { rate: 10 }"
-        path = _write_tmp(content)
-        try:
-            with pytest.raises(RuleError, match="Failed to load rules"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        _assert_rule_error(content, "Failed to load rules")
 
     def test_empty_file_handling(self):
         """Test handling of completely empty YAML file."""
-        path = _write_tmp("")
-        try:
-            rules = load_rules(path)
-            assert rules == {"limits": {}, "drop": set(), "remap": {}}
-        finally:
-            os.unlink(path)
+        rules = load_rules_from_string("")
+        assert rules == {"limits": {}, "drop": set(), "remap": {}}
 
     def test_yaml_with_null_values(self):
         """Test handling of null/None values in YAML."""
-        path = _write_tmp("""
-        limits: null
-        actions: null
-        """)
-        try:
-            # null limits should raise validation error
-            with pytest.raises(RuleError, match="limits: must be a mapping"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        # null limits should raise validation error
+        _assert_rule_error(_YAML_NULL_SECTIONS, "limits: must be a mapping")
 
 
 class TestCanIdParsing:
     """Test CAN ID parsing edge cases and boundary conditions."""
 
-    def test_can_id_boundary_values(self):
+    @pytest.mark.parametrize("input_val,expected", BOUNDARY_CAN_IDS)
+    def test_can_id_boundary_values(self, input_val, expected):
         """Test CAN ID parsing at boundary values."""
-        # Minimum valid ID
-        assert _parse_can_id(0, field="test") == 0
-        assert _parse_can_id("0", field="test") == 0
-        assert _parse_can_id("0x0", field="test") == 0
-        
-        # Maximum 11-bit ID (standard CAN)
-        assert _parse_can_id(0x7FF, field="test") == 0x7FF
-        assert _parse_can_id("2047", field="test") == 0x7FF
-        assert _parse_can_id("0x7FF", field="test") == 0x7FF
-        
-        # Maximum 29-bit ID (extended CAN)
-        assert _parse_can_id(MAX_CAN_ID, field="test") == MAX_CAN_ID
-        assert _parse_can_id("0x1FFFFFFF", field="test") == MAX_CAN_ID
+        assert _parse_can_id(input_val, field="test") == expected
 
-    def test_can_id_format_variations(self):
+    @pytest.mark.parametrize("input_val,expected", CAN_ID_FORMAT_VARIATIONS)
+    def test_can_id_format_variations(self, input_val, expected):
         """Test various CAN ID format inputs."""
-        test_cases = [
-            ("0x123", 0x123),
-            ("0X123", 0x123),  # Uppercase X
-            ("0x0123", 0x123),  # Leading zeros
-            ("123", 123),
-            ("  123  ", 123),  # Whitespace
-            ("12_3", 123),     # Underscores (should be removed)
-        ]
-        
-        for input_val, expected in test_cases:
-            assert _parse_can_id(input_val, field="test") == expected
+        assert _parse_can_id(input_val, field="test") == expected
 
-    def test_can_id_invalid_formats(self):
+    @pytest.mark.parametrize("invalid_input,expected_error", INVALID_CAN_ID_FORMATS)
+    def test_can_id_invalid_formats(self, invalid_input, expected_error):
         """Test invalid CAN ID format handling."""
-        invalid_cases = [
-            (None, "must be int or hex/dec string"),
-            ([], "must be int or hex/dec string"),
-            ({}, "must be int or hex/dec string"),
-            (3.14, "must be int or hex/dec string"),
-            ("", "invalid CAN ID format"),
-            ("0x", "invalid CAN ID format"),
-            ("xyz", "invalid CAN ID format"),
-            ("0xGHI", "invalid CAN ID format"),
-            ("12.34", "invalid CAN ID format"),
-            ("0b1010", "invalid CAN ID format"),  # Binary not supported
-        ]
-        
-        for invalid_input, expected_error in invalid_cases:
-            with pytest.raises(RuleError, match=expected_error):
-                _parse_can_id(invalid_input, field="test_field")
+        with pytest.raises(RuleError, match=expected_error):
+            _parse_can_id(invalid_input, field="test_field")
 
-    def test_can_id_out_of_range(self):
+    @pytest.mark.parametrize("invalid_id", OUT_OF_RANGE_CAN_IDS)
+    def test_can_id_out_of_range(self, invalid_id):
         """Test CAN ID range validation."""
-        out_of_range_cases = [
-            -1,
-            -100,
-            "0x20000000",  # Just above MAX_CAN_ID
-            "0x30000000",
-            MAX_CAN_ID + 1,
-            "999999999",   # Large decimal
-        ]
-        
-        for invalid_id in out_of_range_cases:
-            with pytest.raises(RuleError, match="out of range"):
-                _parse_can_id(invalid_id, field="test")
+        with pytest.raises(RuleError, match="out of range"):
+            _parse_can_id(invalid_id, field="test")
 
 
 class TestLimitsSection:
     """Test limits section parsing and validation."""
 
-    def test_limits_non_dict_types(self):
+    @pytest.mark.parametrize("limits_val,expected_error", INVALID_LIMITS_SECTIONS)
+    def test_limits_non_dict_types(self, limits_val, expected_error):
         """Test invalid limits section types."""
-        invalid_limits = [
-            ("limits: []", "must be a mapping"),
-            ("limits: 'string'", "must be a mapping"), 
-            ("limits: 123", "must be a mapping"),
-            ("limits: null", "must be a mapping"),
-        ]
-        
-        for yaml_content, expected_error in invalid_limits:
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
-
-    def test_limits_invalid_config_types(self):
+        _assert_invalid_doc({"limits": limits_val}, expected_error)
+
+    @pytest.mark.parametrize("limit_config,expected_error", INVALID_LIMIT_CONFIGS)
+    def test_limits_invalid_config_types(self, limit_config, expected_error):
         """Test invalid limit configuration types."""
-        invalid_configs = [
-            ('limits: {"0x123": "not a dict"}', "value must be a mapping"),
-            ('limits: {"0x123": []}', "value must be a mapping"),
-            ('limits: {"0x123": 123}', "value must be a mapping"),
-            ('limits: {"0x123": null}', "value must be a mapping"),
-        ]
-        
-        for yaml_content, expected_error in invalid_configs:
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
+        _assert_invalid_doc({"limits": {"0x123": limit_config}}, expected_error)
 
     def test_limits_missing_required_fields(self):
         """Test missing required fields in limit config."""
-        path = _write_tmp("""
-        limits:
-          "0x123": { burst: 10 }  # Missing rate
-        """)
-        try:
-            with pytest.raises(RuleError, match="missing 'rate'"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        _assert_invalid_doc({"limits": {"0x123": {"burst": 10}}}, "missing 'rate'")
 
-    def test_limits_invalid_rate_values(self):
+    @pytest.mark.parametrize("rate_val,expected_error", INVALID_RATES)
+    def test_limits_invalid_rate_values(self, rate_val, expected_error):
         """Test invalid rate value types and ranges."""
-        invalid_rates = [
-            (0, "must be > 0"),
-            (-1, "must be > 0"),
-            (-0.5, "must be > 0"),
-            ("not_a_number", "must be > 0"),
-            (None, "must be > 0"),
-            ([], "must be > 0"),
-        ]
-        
-        for rate_val, expected_error in invalid_rates:
-            yaml_content = f"""
-            limits:
-              "0x123": {{ rate: {repr(rate_val)} }}
-            """
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
-
-    def test_limits_invalid_burst_values(self):
+        _assert_invalid_doc({"limits": {"0x123": {"rate": rate_val}}}, expected_error)
+
+    @pytest.mark.parametrize("burst_val,expected_error", INVALID_BURSTS)
+    def test_limits_invalid_burst_values(self, burst_val, expected_error):
         """Test invalid burst value types and ranges."""
-        invalid_bursts = [
-            (0, "must be >= 1"),
-            (-1, "must be >= 1"),
-            (0.5, "must be >= 1"),  # Float burst not allowed
-            ("5", "must be >= 1"),  # String not allowed
-            (None, "must be >= 1"),
-        ]
-        
-        for burst_val, expected_error in invalid_bursts:
-            yaml_content = f"""
-            limits:
-              "0x123": {{ rate: 10, burst: {repr(burst_val)} }}
-            """
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
+        _assert_invalid_doc({"limits": {"0x123": {"rate": 10, "burst": burst_val}}}, expected_error)
 
     def test_limits_default_burst_calculation(self):
         """Test default burst calculation when not specified."""
-        path = _write_tmp("""
-        limits:
-          "0x123": { rate: 10.7 }    # Should ceil to 11
-          "0x456": { rate: 5.0 }     # Should be 5
-          "0x789": { rate: 1.1 }     # Should ceil to 2
-        """)
-        try:
-            rules = load_rules(path)
-            assert rules["limits"][0x123]["burst"] == 11  # ceil(10.7)
-            assert rules["limits"][0x456]["burst"] == 5   # ceil(5.0) 
-            assert rules["limits"][0x789]["burst"] == 2   # ceil(1.1)
-        finally:
-            os.unlink(path)
+        rules = load_rules_from_string(_YAML_DEFAULT_BURSTS)
+        assert rules["limits"][0x123]["burst"] == 11  # ceil(10.7)
+        assert rules["limits"][0x456]["burst"] == 5   # ceil(5.0) 
+        assert rules["limits"][0x789]["burst"] == 2   # ceil(1.1)
 
 
 class TestActionsSection:
     """Test actions section parsing and validation."""
 
-    def test_actions_non_dict_types(self):
+    @pytest.mark.parametrize("actions_val,expected_error", INVALID_ACTIONS_SECTIONS)
+    def test_actions_non_dict_types(self, actions_val, expected_error):
         """Test invalid actions section types."""
-        invalid_actions = [
-            ("actions: []", "must be a mapping"),
-            ("actions: 'string'", "must be a mapping"),
-            ("actions: 123", "must be a mapping"),
-        ]
-        
-        for yaml_content, expected_error in invalid_actions:
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
-
-    def test_drop_list_invalid_types(self):
+        _assert_invalid_doc({"actions": actions_val}, expected_error)
+
+    @pytest.mark.parametrize("drop_val,expected_error", INVALID_DROP_LISTS)
+    def test_drop_list_invalid_types(self, drop_val, expected_error):
         """Test invalid drop list types."""
-        invalid_drops = [
-            ("actions: { drop: 'not a list' }", "must be a list"),
-            ("actions: { drop: 123 }", "must be a list"),
-            ("actions: { drop: {} }", "must be a list"),
-        ]
-        
-        for yaml_content, expected_error in invalid_drops:
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
-
-    def test_remap_list_invalid_types(self):
+        _assert_invalid_doc({"actions": {"drop": drop_val}}, expected_error)
+
+    @pytest.mark.parametrize("remap_val,expected_error", INVALID_REMAP_LISTS)
+    def test_remap_list_invalid_types(self, remap_val, expected_error):
         """Test invalid remap list types."""
-        invalid_remaps = [
-            ("actions: { remap: 'not a list' }", "must be a list"),
-            ("actions: { remap: 123 }", "must be a list"),
-            ("actions: { remap: {} }", "must be a list"),
-        ]
-        
-        for yaml_content, expected_error in invalid_remaps:
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
-
-    def test_remap_invalid_item_structure(self):
+        _assert_invalid_doc({"actions": {"remap": remap_val}}, expected_error)
+
+    @pytest.mark.parametrize("remap_item,expected_error", INVALID_REMAP_ITEMS)
+    def test_remap_invalid_item_structure(self, remap_item, expected_error):
         """Test invalid remap item structures."""
-        invalid_items = [
-            ('actions: { remap: ["not a dict"] }', "each item must be"),
-            ('actions: { remap: [123] }', "each item must be"),
-            ('actions: { remap: [{}] }', "each item must be"),  # Missing from/to
-            ('actions: { remap: [{ from: "0x123" }] }', "each item must be"),  # Missing to
-            ('actions: { remap: [{ to: "0x123" }] }', "each item must be"),    # Missing from
-        ]
-        
-        for yaml_content, expected_error in invalid_items:
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError, match=expected_error):
-                    load_rules(path)
-            finally:
-                os.unlink(path)
+        _assert_invalid_doc({"actions": {"remap": [remap_item]}}, expected_error)
 
     def test_remap_identical_from_to(self):
         """Test remap with identical from and to IDs."""
-        path = _write_tmp("""
-        actions:
-          remap:
-            - { from: "0x123", to: "0x123" }  # Identical
-        """)
-        try:
-            with pytest.raises(RuleError, match="from and to are identical"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        doc = {"actions": {"remap": [{"from": "0x123", "to": "0x123"}]}}  # Identical
+        _assert_invalid_doc(doc, "from and to are identical")
 
     def test_remap_duplicate_from_ids(self):
         """Test remap with duplicate from IDs."""
-        path = _write_tmp("""
-        actions:
-          remap:
-            - { from: "0x123", to: "0x456" }
-            - { from: "0x123", to: "0x789" }  # Duplicate from
-        """)
-        try:
-            with pytest.raises(RuleError, match="duplicate 'from' ID"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        doc = {"actions": {"remap": [
+            {"from": "0x123", "to": "0x456"},
+            {"from": "0x123", "to": "0x789"},  # Duplicate from
+        ]}}
+        _assert_invalid_doc(doc, "duplicate 'from' ID")
+
+    def test_remap_reports_first_bad_item(self):
+        """Test remap errors are reported for the first bad item, in list order."""
+        doc = {"actions": {"remap": [
+            {"from": 1, "to": None},  # Bad 'to' type in the first item
+            {"from": "291"},          # Malformed second item
+        ]}}
+        _assert_invalid_doc(doc, r"actions\.remap\.to: CAN ID must be int")
 
 
 class TestBoundaryConditions:
@@ -365,74 +314,43 @@ class TestBoundaryConditions:
 
     def test_maximum_limits_entries(self):
         """Test parsing large numbers of limit entries."""
-        # Generate many limit entries
-        limits_yaml = "limits:\n"
-        for i in range(1000):  # Test with 1000 entries
-            limits_yaml += f'  "0x{i:X}": {{ rate: {i + 1} }}\n'
+        # Generate many limit entries (1000), joined once
+        limits_yaml = "limits:\n" + "\n".join(f'  "0x{i:X}": {{ rate: {i + 1} }}' for i in range(1000))
         
-        path = _write_tmp(limits_yaml)
-        try:
-            rules = load_rules(path)
-            assert len(rules["limits"]) == 1000
-            assert rules["limits"][0x123]["rate"] == 292.0  # 0x123 + 1
-        finally:
-            os.unlink(path)
+        rules = load_rules_from_string(limits_yaml)
+        assert len(rules["limits"]) == 1000
+        assert rules["limits"][0x123]["rate"] == 292.0  # 0x123 + 1
 
     def test_mixed_id_formats_in_same_file(self):
         """Test mixing different ID formats in same file."""
-        path = _write_tmp("""
-        limits:
-          "0x100": { rate: 10 }      # Hex string
-          256: { rate: 20 }          # Decimal int
-          "0X101": { rate: 30 }      # Uppercase hex
-          "258": { rate: 40 }        # Decimal string
-        actions:
-          drop: ["0x200", 513, "0X202", "515"]
-          remap:
-            - { from: "0x300", to: 769 }     # Hex to decimal
-            - { from: 770, to: "0x303" }     # Decimal to hex
-        """)
-        try:
-            rules = load_rules(path)
-            
-            # Check limits normalized correctly
-            assert 0x100 in rules["limits"]
-            assert 256 in rules["limits"]
-            assert 0x101 in rules["limits"]
-            assert 258 in rules["limits"]
-            
-            # Check drop set normalized
-            assert {0x200, 513, 0x202, 515}.issubset(rules["drop"])
-            
-            # Check remap dict normalized
-            assert rules["remap"][0x300] == 769
-            assert rules["remap"][770] == 0x303
-        finally:
-            os.unlink(path)
+        rules = load_rules_from_string(_YAML_MIXED_ID_FORMATS)
+        
+        # Check limits normalized correctly
+        assert 0x100 in rules["limits"]
+        assert 256 in rules["limits"]
+        assert 0x101 in rules["limits"]
+        assert 258 in rules["limits"]
+        
+        # Check drop set normalized
+        assert {0x200, 513, 0x202, 515}.issubset(rules["drop"])
+        
+        # Check remap dict normalized
+        assert rules["remap"][0x300] == 769
+        assert rules["remap"][770] == 0x303
 
     def test_unicode_and_special_characters_in_yaml(self):
         """Test handling of Unicode and special characters."""
-        path = _write_tmp("""
-        # Comments with üñíçødé characters
-        limits:
-          "0x123": { rate: 10 }  # Comment with émojis 🚗💨
-        actions:
-          drop: ["0x456"]        # More ünîcødé
-        """)
-        try:
-            rules = load_rules(path)
-            assert 0x123 in rules["limits"]
-            assert 0x456 in rules["drop"]
-        finally:
-            os.unlink(path)
+        rules = load_rules_from_string(_YAML_UNICODE_COMMENTS)
+        assert 0x123 in rules["limits"]
+        assert 0x456 in rules["drop"]
 
 
 class TestResourceCleanup:
     """Test proper resource cleanup in various scenarios."""
 
-    def test_file_handle_cleanup_on_success(self):
+    def test_file_handle_cleanup_on_success(self, make_yaml):
         """Test file handles are properly closed on successful parsing."""
-        path = _write_tmp("""
+        path = make_yaml("""
         limits:
           "0x123": { rate: 10 }
         """)
@@ -449,9 +367,9 @@ class TestResourceCleanup:
             # If we can't delete, file handle wasn't closed properly
             pytest.fail("File handle not properly closed after successful parsing")
 
-    def test_file_handle_cleanup_on_error(self):
+    def test_file_handle_cleanup_on_error(self, make_yaml):
         """Test file handles are properly closed even when parsing fails."""
-        path = _write_tmp("""
+        path = make_yaml("""
         limits:
           "0x123": { rate: -1 }  # Invalid rate
         """)
@@ -7,27 +7,15 @@ with realistic CAN traffic shaping rules.
 """
 
 import pytest
-import tempfile
-import os
-import textwrap
 from socketcan_sa.rules import load_rules, RuleError
 
 
-def _write_tmp(yaml_text: str) -> str:
-    """Helper to write temporary YAML file."""
-    fd, path = tempfile.mkstemp(suffix=".yaml")
-    os.close(fd)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(textwrap.dedent(yaml_text))
-    return path
-
-
 class TestRealWorldConfigurations:
     """Test realistic CAN traffic shaping configurations."""
 
-    def test_automotive_ecu_configuration(self):
+    def test_automotive_ecu_configuration(self, make_yaml):
         """Test realistic automotive ECU traffic shaping rules."""
-        path = _write_tmp("""
+        path = make_yaml("""
         # Automotive ECU Rate Limits
         limits:
           # Engine Management
@@ -63,31 +51,27 @@ class TestRealWorldConfigurations:
             - { from: "0x400", to: "0x500" }   # Old door status -> new
         """)
         
-        try:
-            rules = load_rules(path)
-            
-            # Verify engine management rates
-            assert rules["limits"][0x7E0]["rate"] == 100.0
-            assert rules["limits"][0x7E0]["burst"] == 20
-            
-            # Verify safety system priorities (higher rates)
-            assert rules["limits"][0x300]["rate"] == 200.0  # ABS highest
-            assert rules["limits"][0x301]["rate"] == 100.0  # Airbag high
-            
-            # Verify infotainment blocking
-            assert 0x600 in rules["drop"]
-            assert 0x601 in rules["drop"]
-            
-            # Verify legacy ID remapping
-            assert rules["remap"][0x7E5] == 0x7E0
-            assert rules["remap"][0x400] == 0x500
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        # Verify engine management rates
+        assert rules["limits"][0x7E0]["rate"] == 100.0
+        assert rules["limits"][0x7E0]["burst"] == 20
+        
+        # Verify safety system priorities (higher rates)
+        assert rules["limits"][0x300]["rate"] == 200.0  # ABS highest
+        assert rules["limits"][0x301]["rate"] == 100.0  # Airbag high
+        
+        # Verify infotainment blocking
+        assert 0x600 in rules["drop"]
+        assert 0x601 in rules["drop"]
+        
+        # Verify legacy ID remapping
+        assert rules["remap"][0x7E5] == 0x7E0
+        assert rules["remap"][0x400] == 0x500
 
-    def test_industrial_can_bus_configuration(self):
+    def test_industrial_can_bus_configuration(self, make_yaml):
         """Test industrial CAN bus traffic management rules."""
-        path = _write_tmp("""
+        path = make_yaml("""
         # Industrial Automation Network
         limits:
           # High-priority control loops (1-100ms)
@@ -118,31 +102,27 @@ class TestRealWorldConfigurations:
             - { from: "0x251", to: "0x201" }   # Backup vibration
         """)
         
-        try:
-            rules = load_rules(path)
-            
-            # Verify control loop priorities (highest rates)
-            assert rules["limits"][0x100]["rate"] == 1000.0
-            assert rules["limits"][0x101]["rate"] == 500.0
-            
-            # Verify sensor rates are lower
-            assert rules["limits"][0x200]["rate"] == 100.0
-            assert rules["limits"][0x201]["rate"] == 50.0
-            
-            # Verify diagnostics have lowest rates
-            assert rules["limits"][0x300]["rate"] == 10.0
-            assert rules["limits"][0x302]["rate"] == 1.0
-            
-            # Verify debug filtering
-            debug_ids = {0x7F0, 0x7F1, 0x7F2}
-            assert debug_ids.issubset(rules["drop"])
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        # Verify control loop priorities (highest rates)
+        assert rules["limits"][0x100]["rate"] == 1000.0
+        assert rules["limits"][0x101]["rate"] == 500.0
+        
+        # Verify sensor rates are lower
+        assert rules["limits"][0x200]["rate"] == 100.0
+        assert rules["limits"][0x201]["rate"] == 50.0
+        
+        # Verify diagnostics have lowest rates
+        assert rules["limits"][0x300]["rate"] == 10.0
+        assert rules["limits"][0x302]["rate"] == 1.0
+        
+        # Verify debug filtering
+        debug_ids = {0x7F0, 0x7F1, 0x7F2}
+        assert debug_ids.issubset(rules["drop"])
 
-    def test_can_fd_extended_id_configuration(self):
+    def test_can_fd_extended_id_configuration(self, make_yaml):
         """Test configuration with CAN FD extended 29-bit IDs."""
-        path = _write_tmp("""
+        path = make_yaml("""
         # CAN FD with Extended IDs (29-bit)
         limits:
           # Extended format IDs (automotive standard)
@@ -162,32 +142,28 @@ class TestRealWorldConfigurations:
             - { from: "0x18DA00F1", to: "0x18DA10F1" }  # Legacy diagnostic
         """)
         
-        try:
-            rules = load_rules(path)
-            
-            # Verify extended ID parsing
-            assert 0x18DA10F1 in rules["limits"]
-            assert 0x1CFECA00 in rules["limits"]
-            assert 0x1CFF0000 in rules["limits"]
-            
-            # Verify rates are properly assigned
-            assert rules["limits"][0x1CFF0000]["rate"] == 200.0  # Highest priority
-            assert rules["limits"][0x18DA10F1]["rate"] == 50.0   # Diagnostic
-            
-            # Verify extended ID actions
-            assert 0x1FFFFF00 in rules["drop"]
-            assert rules["remap"][0x18DA00F1] == 0x18DA10F1
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        # Verify extended ID parsing
+        assert 0x18DA10F1 in rules["limits"]
+        assert 0x1CFECA00 in rules["limits"]
+        assert 0x1CFF0000 in rules["limits"]
+        
+        # Verify rates are properly assigned
+        assert rules["limits"][0x1CFF0000]["rate"] == 200.0  # Highest priority
+        assert rules["limits"][0x18DA10F1]["rate"] == 50.0   # Diagnostic
+        
+        # Verify extended ID actions
+        assert 0x1FFFFF00 in rules["drop"]
+        assert rules["remap"][0x18DA00F1] == 0x18DA10F1
 
 
 class TestComplexValidationScenarios:
     """Test complex validation and cross-section interactions."""
 
-    def test_limits_and_actions_interaction(self):
+    def test_limits_and_actions_interaction(self, make_yaml):
         """Test interaction between limits and actions for same IDs."""
-        path = _write_tmp("""
+        path = make_yaml("""
         limits:
           "0x123": { rate: 50, burst: 10 }
           "0x456": { rate: 25, burst: 5 }
@@ -198,20 +174,16 @@ class TestComplexValidationScenarios:
             - { from: "0x456", to: "0x789" }  # From ID also in limits
         """)
         
-        try:
-            rules = load_rules(path)
-            
-            # Should allow ID to be in both limits and actions
-            assert 0x123 in rules["limits"]
-            assert 0x123 in rules["drop"]
-            
-            assert 0x456 in rules["limits"]  
-            assert rules["remap"][0x456] == 0x789
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        # Should allow ID to be in both limits and actions
+        assert 0x123 in rules["limits"]
+        assert 0x123 in rules["drop"]
+        
+        assert 0x456 in rules["limits"]  
+        assert rules["remap"][0x456] == 0x789
 
-    def test_large_configuration_parsing(self):
+    def test_large_configuration_parsing(self, make_yaml):
         """Test parsing of large, complex configuration."""
         # Generate large config with many entries
         yaml_lines = ["# Large CAN configuration", "limits:"]
@@ -244,49 +216,41 @@ class TestComplexValidationScenarios:
             to_id = 0x900 + i  
             yaml_lines.append(f'    - {{ from: "0x{from_id:X}", to: "0x{to_id:X}" }}')
         
-        path = _write_tmp("\n".join(yaml_lines))
+        path = make_yaml("\n".join(yaml_lines), dedent=False)
         
-        try:
-            rules = load_rules(path)
-            
-            # Verify correct parsing of large config
-            assert len(rules["limits"]) == 500
-            assert len(rules["drop"]) == 100
-            assert len(rules["remap"]) == 50
-            
-            # Spot check some entries
-            assert rules["limits"][0x150]["rate"] == 90.0  # 10 + (0x50 % 100)
-            assert 0x750 in rules["drop"]
-            assert rules["remap"][0x820] == 0x920
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        # Verify correct parsing of large config
+        assert len(rules["limits"]) == 500
+        assert len(rules["drop"]) == 100
+        assert len(rules["remap"]) == 50
+        
+        # Spot check some entries
+        assert rules["limits"][0x150]["rate"] == 90.0  # 10 + (0x50 % 100)
+        assert 0x750 in rules["drop"]
+        assert rules["remap"][0x820] == 0x920
 
 
 class TestFileFormatCompatibility:
     """Test compatibility with various YAML file formats and styles."""
 
-    def test_yaml_flow_style_syntax(self):
+    def test_yaml_flow_style_syntax(self, make_yaml):
         """Test YAML flow style (inline) syntax."""
-        path = _write_tmp("""
+        path = make_yaml("""
         limits: {"0x123": {rate: 10, burst: 5}, "0x456": {rate: 20}}
         actions: {drop: ["0x789", "0xABC"], remap: [{from: "0x100", to: "0x200"}]}
         """)
         
-        try:
-            rules = load_rules(path)
-            
-            assert rules["limits"][0x123]["rate"] == 10.0
-            assert rules["limits"][0x456]["burst"] == 20  # Default ceil(20)
-            assert 0x789 in rules["drop"]
-            assert rules["remap"][0x100] == 0x200
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        assert rules["limits"][0x123]["rate"] == 10.0
+        assert rules["limits"][0x456]["burst"] == 20  # Default ceil(20)
+        assert 0x789 in rules["drop"]
+        assert rules["remap"][0x100] == 0x200
 
-    def test_yaml_block_style_variations(self):
+    def test_yaml_block_style_variations(self, make_yaml):
         """Test various YAML block style formats."""
-        path = _write_tmp("""
+        path = make_yaml("""
         limits:
           0x123:          # Unquoted hex (valid YAML)
             rate: 10
@@ -307,20 +271,16 @@ class TestFileFormatCompatibility:
               to: "0x200"      # Quoted to
         """)
         
-        try:
-            rules = load_rules(path)
-            
-            # Should parse correctly (0x123 and 291 are different IDs)
-            assert len(rules["limits"]) >= 2  # At least 2 different IDs
-            assert len(rules["drop"]) == 3
-            assert len(rules["remap"]) == 1
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        # Should parse correctly (0x123 and 291 are different IDs)
+        assert len(rules["limits"]) >= 2  # At least 2 different IDs
+        assert len(rules["drop"]) == 3
+        assert len(rules["remap"]) == 1
 
-    def test_yaml_comments_and_whitespace(self):
+    def test_yaml_comments_and_whitespace(self, make_yaml):
         """Test YAML with extensive comments and varied whitespace."""
-        path = _write_tmp("""
+        path = make_yaml("""
         # Main configuration file for CAN traffic shaping
         # Generated on 2025-10-13
         
@@ -349,27 +309,23 @@ class TestFileFormatCompatibility:
         # End of configuration
         """)
         
-        try:
-            rules = load_rules(path)
-            
-            # Should parse correctly despite extensive comments
-            assert len(rules["limits"]) == 3
-            assert len(rules["drop"]) == 2  
-            assert len(rules["remap"]) == 1
-            
-            # Verify specific values
-            assert rules["limits"][0x7E0]["rate"] == 100.0
-            assert rules["limits"][0x7E1]["burst"] == 50  # ceil(50)
-            assert rules["limits"][0x500]["burst"] == 2
-            
-        finally:
-            os.unlink(path)
+        rules = load_rules(path)
+        
+        # Should parse correctly despite extensive comments
+        assert len(rules["limits"]) == 3
+        assert len(rules["drop"]) == 2  
+        assert len(rules["remap"]) == 1
+        
+        # Verify specific values
+        assert rules["limits"][0x7E0]["rate"] == 100.0
+        assert rules["limits"][0x7E1]["burst"] == 50  # ceil(50)
+        assert rules["limits"][0x500]["burst"] == 2
 
 
 class TestErrorRecoveryAndReporting:
     """Test error recovery and detailed error reporting."""
 
-    def test_detailed_error_messages_with_context(self):
+    def test_detailed_error_messages_with_context(self, make_yaml):
         """Test that error messages provide helpful context."""
         # Test with specific field references in error messages
         test_cases = [
@@ -388,32 +344,24 @@ class TestErrorRecoveryAndReporting:
         ]
         
         for yaml_content, expected_context in test_cases:
-            path = _write_tmp(yaml_content)
-            try:
-                with pytest.raises(RuleError) as exc_info:
-                    load_rules(path)
-                
-                # Error message should contain contextual information
-                error_message = str(exc_info.value)
-                assert expected_context in error_message
-                
-            finally:
-                os.unlink(path)
+            path = make_yaml(yaml_content)
+            with pytest.raises(RuleError) as exc_info:
+                load_rules(path)
+            
+            # Error message should contain contextual information
+            error_message = str(exc_info.value)
+            assert expected_context in error_message
 
-    def test_multiple_errors_in_same_file(self):
+    def test_multiple_errors_in_same_file(self, make_yaml):
         """Test behavior when multiple errors exist in same file."""
         # This will fail on the first error encountered
-        path = _write_tmp("""
+        path = make_yaml("""
         limits:
           "invalid_id_1": { rate: -1 }      # First error - negative rate
           "invalid_id_2": { rate: 0 }       # Second error - zero rate  
           "0x123": { rate: "not_number" }   # Third error - invalid type
         """)
         
-        try:
-            with pytest.raises(RuleError):
-                load_rules(path)
-            # Should fail fast on first error, not collect all errors
-            
-        finally:
-            os.unlink(path)
\ No newline at end of file
+        with pytest.raises(RuleError):
+            load_rules(path)
+        # Should fail fast on first error, not collect all errors
\ No newline at end of file
@@ -3,9 +3,10 @@ from socketcan_sa.rules import load_rules, RuleError
 
 def _write_tmp(yaml_text: str) -> str:
     fd, path = tempfile.mkstemp(suffix=".yaml")
-    os.close(fd)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(textwrap.dedent(yaml_text))
+    try:
+        os.write(fd, textwrap.dedent(yaml_text).encode("utf-8"))
+    finally:
+        os.close(fd)
     return path
 
 def test_rules_valid_parsing_hex_and_dec():
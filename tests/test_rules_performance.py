@@ -14,80 +14,65 @@ import time
 import tempfile
 import os
 import textwrap
-try:
-    import psutil
-    PSUTIL_AVAILABLE = True
-except ImportError:
-    PSUTIL_AVAILABLE = False
+import psutil
 from socketcan_sa.rules import load_rules, _parse_can_id, MAX_CAN_ID
 
 
-def _write_tmp(yaml_text: str) -> str:
-    """Helper to write temporary YAML file."""
+def _write_tmp(yaml_text: str, dedent: bool = True) -> str:
+    """Helper to write temporary YAML file.
+
+    Pass ``dedent=False`` for generated YAML that is already flush-left.
+    """
+    if dedent:
+        yaml_text = textwrap.dedent(yaml_text)
     fd, path = tempfile.mkstemp(suffix=".yaml")
-    os.close(fd)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(textwrap.dedent(yaml_text))
+    try:
+        os.write(fd, yaml_text.encode("utf-8"))
+    finally:
+        os.close(fd)
     return path
 
 
-@pytest.mark.timeout(60)  # Prevent hanging
 class TestRulesPerformance:
     """Performance benchmark tests for rules functionality."""
 
+    @pytest.mark.timeout(60)
     def test_large_configuration_parsing_performance(self):
         """Test parsing performance with large configuration files."""
         # Generate large configuration (5000 limits + 1000 drops + 500 remaps)
-        yaml_lines = ["# Large CAN configuration for performance testing"]
-        
-        # Limits section (5000 entries)
-        yaml_lines.append("limits:")
-        for i in range(5000):
-            can_id = 0x1000 + i
-            rate = 10 + (i % 1000)
-            burst = max(1, rate // 5)
-            yaml_lines.append(f'  "0x{can_id:X}": {{ rate: {rate}, burst: {burst} }}')
-        
-        # Actions section
-        yaml_lines.append("actions:")
-        yaml_lines.append("  drop:")
-        
-        # Drop list (1000 entries)
-        for i in range(1000):
-            can_id = 0x10000 + i
-            yaml_lines.append(f'    - "0x{can_id:X}"')
-        
-        # Remap list (500 entries)
-        yaml_lines.append("  remap:")
-        for i in range(500):
-            from_id = 0x20000 + i
-            to_id = 0x30000 + i
-            yaml_lines.append(f'    - {{ from: "0x{from_id:X}", to: "0x{to_id:X}" }}')
+        yaml_lines = [
+            "# Large CAN configuration for performance testing",
+            # Limits section (5000 entries)
+            "limits:",
+            *(f'  "0x{0x1000 + i:X}": {{ rate: {10 + i % 1000}, burst: {max(1, (10 + i % 1000) // 5)} }}'
+              for i in range(5000)),
+            # Actions section: drop list (1000 entries), remap list (500 entries)
+            "actions:",
+            "  drop:",
+            *(f'    - "0x{0x10000 + i:X}"' for i in range(1000)),
+            "  remap:",
+            *(f'    - {{ from: "0x{0x20000 + i:X}", to: "0x{0x30000 + i:X}" }}' for i in range(500)),
+        ]
         
-        path = _write_tmp("\n".join(yaml_lines))
+        path = _write_tmp("\n".join(yaml_lines), dedent=False)
         
         try:
             # Measure parsing time
             start_time = time.perf_counter()
-            if PSUTIL_AVAILABLE:
-                process = psutil.Process()
-                start_memory = process.memory_info().rss / 1024 / 1024  # MB
+            process = psutil.Process()
+            start_memory = process.memory_info().rss / 1024 / 1024  # MB
             
             rules = load_rules(path)
             
             end_time = time.perf_counter()
             parsing_time = end_time - start_time
             
-            if PSUTIL_AVAILABLE:
-                end_memory = process.memory_info().rss / 1024 / 1024  # MB
-                memory_usage = end_memory - start_memory
-            else:
-                memory_usage = 0
+            end_memory = process.memory_info().rss / 1024 / 1024  # MB
+            memory_usage = end_memory - start_memory
             
             # Performance assertions
             assert parsing_time < 10.0, f"Large config parsing too slow: {parsing_time:.2f}s"
-            if PSUTIL_AVAILABLE:
-                assert memory_usage < 100, f"Memory usage too high: {memory_usage:.1f}MB"
+            assert memory_usage < 100, f"Memory usage too high: {memory_usage:.1f}MB"
             
             # Verify correct parsing
             assert len(rules["limits"]) == 5000
@@ -129,6 +114,7 @@ class TestRulesPerformance:
             
             print(f"CAN ID parsing ({format_type}): {per_parse:.4f}ms per parse")
 
+    @pytest.mark.timeout(60)
     def test_validation_performance_complex_config(self):
         """Test validation performance with complex interconnected rules."""
         # Create config with overlapping IDs between sections
@@ -158,7 +144,7 @@ class TestRulesPerformance:
             to_id = base_ids[i * 4 + 1] + 0x10000  # Ensure no collision
             yaml_lines.append(f'    - {{ from: "0x{from_id:X}", to: "0x{to_id:X}" }}')
         
-        path = _write_tmp("\n".join(yaml_lines))
+        path = _write_tmp("\n".join(yaml_lines), dedent=False)
         
         try:
             start_time = time.perf_counter()
@@ -180,10 +166,10 @@ class TestRulesPerformance:
         finally:
             os.unlink(path)
 
+    @pytest.mark.timeout(60)
     def test_memory_efficiency_repeated_parsing(self):
         """Test memory efficiency with repeated parsing operations."""
-        if not PSUTIL_AVAILABLE:
-            pytest.skip("psutil not available for memory monitoring")
+        process = psutil.Process()
         
         # Create moderate-sized config with proper YAML formatting
         yaml_lines = ["limits:"]
@@ -201,10 +187,9 @@ class TestRulesPerformance:
         
         yaml_content = "\n".join(yaml_lines)
         
-        path = _write_tmp(yaml_content)
+        path = _write_tmp(yaml_content, dedent=False)
         
         try:
-            process = psutil.Process()
             initial_memory = process.memory_info().rss / 1024 / 1024  # MB
             
             # Parse same file multiple times
@@ -216,8 +201,8 @@ class TestRulesPerformance:
                 assert len(rules["drop"]) == 200
                 assert len(rules["remap"]) == 100
                 
-                # Check memory growth every few iterations
-                if i % 5 == 0:
+                # Check memory growth once mid-loop; the final reading follows the loop
+                if i == 10:
                     current_memory = process.memory_info().rss / 1024 / 1024
                     memory_growth = current_memory - initial_memory
                     
@@ -226,6 +211,7 @@ class TestRulesPerformance:
             
             final_memory = process.memory_info().rss / 1024 / 1024
             total_growth = final_memory - initial_memory
+            assert total_growth < 50, f"Memory leak detected: {total_growth:.1f}MB growth after 20 parses"
             
             print(f"Memory efficiency: {total_growth:.1f}MB growth over 20 parses")
             
@@ -285,7 +271,7 @@ class TestRulesPerformance:
             rate = 10 + (i % 100)
             yaml_lines.append(f'  "0x{can_id:X}": {{ rate: {rate} }}')
         
-        path = _write_tmp("\n".join(yaml_lines))
+        path = _write_tmp("\n".join(yaml_lines), dedent=False)
         
         try:
             start_time = time.perf_counter()
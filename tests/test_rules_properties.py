@@ -6,77 +6,140 @@ Uses Hypothesis to generate test cases and validate mathematical properties
 and invariants of the rules parsing and validation system.
 """
 
+import json
 import pytest
-import tempfile
-import os
 import textwrap
 import math
-from hypothesis import given, strategies as st, settings, assume
-from socketcan_sa.rules import load_rules, RuleError, _parse_can_id, MAX_CAN_ID
+import re
+from hypothesis import given, strategies as st, assume, target
+from socketcan_sa.rules import load_rules, load_rules_from_string, validate_rules, RuleError, _parse_can_id, MAX_CAN_ID
 
 
-def _write_tmp(yaml_text: str) -> str:
-    """Helper to write temporary YAML file."""
-    fd, path = tempfile.mkstemp(suffix=".yaml")
-    os.close(fd)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(textwrap.dedent(yaml_text))
-    return path
+# RuleError message patterns for pytest.raises(match=...)
+_OUT_OF_RANGE_RE = re.compile(r"out of range")
+_RATE_NOT_POSITIVE_RE = re.compile(r"must be > 0")
+_BURST_BELOW_ONE_RE = re.compile(r"must be >= 1")
+_REMAP_IDENTICAL_RE = re.compile(r"from and to are identical")
+
+# YAML templates, dedented once at import; examples only fill in the numbers
+_DROP_TMPL = textwrap.dedent("""
+    actions:
+      drop: [{ids}]
+    """)
+_REMAP_TMPL = textwrap.dedent("""
+    actions:
+      remap: [{items}]
+    """)
+
+# Boundary values for the plain identity roundtrips: range ends, the 11-bit/29-bit
+# edges and every power of two in between
+ROUNDTRIP_CAN_IDS = sorted({0, 0x7FF, 0x800, MAX_CAN_ID - 1, MAX_CAN_ID,
+                            *(1 << bit for bit in range(29))})
+
+
+def _limits_doc(**limit):
+    """Return a one-entry limits document for ID 0x123, as validate_rules() expects it."""
+    return {"limits": {"0x123": limit}}
+
+
+def _limit_yaml(**limit):
+    """Return the same document as flow-style (JSON) YAML."""
+    return json.dumps(_limits_doc(**limit))
+
+
+# Shared strategies
+VALID_CAN_ID = st.integers(min_value=0, max_value=MAX_CAN_ID)
+OUT_OF_RANGE_CAN_ID = st.integers(min_value=MAX_CAN_ID + 1, max_value=0xFFFFFFFF)
+POSITIVE_RATE = st.floats(min_value=0.1, max_value=1000.0, allow_nan=False, allow_infinity=False)
+
+
+@st.composite
+def can_id_spellings(draw):
+    """Draw a CAN ID and two distinct spellings of it (decimal, 0x/0X hex or plain int)."""
+    can_id = draw(VALID_CAN_ID)
+    formats = [str(can_id), f"0x{can_id:X}", f"0X{can_id:X}", can_id]
+    pair = draw(st.lists(st.sampled_from(formats), min_size=2, max_size=2, unique=True))
+    return can_id, pair
+
+
+# (num_limits, num_drops, num_remaps) corners for the size-scaling checks
+CONFIG_SIZE_CORNERS = [(0, 0, 0), (1, 1, 1), (50, 0, 0), (0, 30, 0), (0, 0, 20), (50, 30, 20)]
+
+
+def _assert_config_sizes(num_limits, num_drops, num_remaps):
+    """Build a config with the given section sizes and check it parses to the same sizes."""
+    # Generate unique CAN IDs for each section (disjoint ranges per section)
+    limits_yaml = [f'  "0x{0x100 + i:X}": {{ rate: {10 + (i % 50)} }}' for i in range(num_limits)]
+    drops_yaml = [f'    - "0x{0x200 + i:X}"' for i in range(num_drops)]
+    remaps_yaml = [f'    - {{ from: "0x{0x300 + i:X}", to: "0x{0x400 + i:X}" }}' for i in range(num_remaps)]
+    
+    # Build complete YAML, emitting only the non-empty sections
+    yaml_parts = [
+        *(["limits:", *limits_yaml] if limits_yaml else ()),
+        *(["actions:"] if drops_yaml or remaps_yaml else ()),
+        *(["  drop:", *drops_yaml] if drops_yaml else ()),
+        *(["  remap:", *remaps_yaml] if remaps_yaml else ()),
+    ]
+    yaml_content = "\n".join(yaml_parts) if yaml_parts else "{}"  # Empty config
+    
+    rules = load_rules_from_string(yaml_content)
+    
+    # Verify correct parsing
+    assert len(rules["limits"]) == num_limits
+    assert len(rules["drop"]) == num_drops  
+    assert len(rules["remap"]) == num_remaps
+    
+    # Verify structure invariants
+    assert isinstance(rules["limits"], dict)
+    assert isinstance(rules["drop"], set)
+    assert isinstance(rules["remap"], dict)
 
 
 class TestCanIdParsingProperties:
     """Property-based tests for CAN ID parsing."""
 
-    @given(can_id=st.integers(min_value=0, max_value=MAX_CAN_ID))
-    @settings(max_examples=100, deadline=1000)
-    def test_can_id_int_roundtrip_property(self, can_id):
+    @pytest.mark.parametrize("can_id", ROUNDTRIP_CAN_IDS)
+    def test_can_id_int_roundtrip(self, can_id):
         """Test that valid integer CAN IDs parse correctly."""
         result = _parse_can_id(can_id, field="test")
         assert result == can_id
         assert isinstance(result, int)
 
-    @given(can_id=st.integers(min_value=0, max_value=MAX_CAN_ID))  
-    @settings(max_examples=100, deadline=1000)
-    def test_can_id_hex_string_roundtrip_property(self, can_id):
+    @pytest.mark.parametrize("can_id", ROUNDTRIP_CAN_IDS)
+    def test_can_id_hex_string_roundtrip(self, can_id):
         """Test that hex string CAN IDs parse to correct integer values."""
         hex_string = f"0x{can_id:X}"
         result = _parse_can_id(hex_string, field="test")
         assert result == can_id
 
-    @given(can_id=st.integers(min_value=0, max_value=MAX_CAN_ID))
-    @settings(max_examples=100, deadline=1000) 
-    def test_can_id_decimal_string_roundtrip_property(self, can_id):
+    @pytest.mark.parametrize("can_id", ROUNDTRIP_CAN_IDS)
+    def test_can_id_decimal_string_roundtrip(self, can_id):
         """Test that decimal string CAN IDs parse correctly."""
         decimal_string = str(can_id)
         result = _parse_can_id(decimal_string, field="test")
         assert result == can_id
 
-    @given(can_id=st.integers(min_value=MAX_CAN_ID + 1, max_value=0xFFFFFFFF))
-    @settings(max_examples=50, deadline=1000)
+    @given(can_id=OUT_OF_RANGE_CAN_ID)
     def test_can_id_out_of_range_property(self, can_id):
         """Test that out-of-range CAN IDs are consistently rejected."""
-        with pytest.raises(RuleError, match="out of range"):
+        with pytest.raises(RuleError, match=_OUT_OF_RANGE_RE):
             _parse_can_id(can_id, field="test")
 
     @given(can_id=st.integers(max_value=-1))
-    @settings(max_examples=50, deadline=1000)
     def test_can_id_negative_property(self, can_id):
         """Test that negative CAN IDs are consistently rejected."""
-        with pytest.raises(RuleError, match="out of range"):
+        with pytest.raises(RuleError, match=_OUT_OF_RANGE_RE):
             _parse_can_id(can_id, field="test")
 
     @given(
-        can_id=st.integers(min_value=0, max_value=MAX_CAN_ID),
+        can_id=VALID_CAN_ID,
         prefix=st.sampled_from(["0x", "0X"]),
         padding=st.integers(min_value=0, max_value=8)
     )
-    @settings(max_examples=100, deadline=1000)
     def test_hex_format_variations_property(self, can_id, prefix, padding):
         """Test various hex format variations parse consistently."""
         # Create hex string with optional zero padding
-        hex_digits = f"{can_id:X}"
-        padded_hex = hex_digits.zfill(len(hex_digits) + padding)
-        hex_string = f"{prefix}{padded_hex}"
+        hex_string = f"{prefix}{'0' * padding}{can_id:X}"
         
         result = _parse_can_id(hex_string, field="test")
         assert result == can_id
@@ -86,142 +149,77 @@ class TestRateLimitProperties:
     """Property-based tests for rate limit validation."""
 
     @given(rate=st.floats(min_value=0.1, max_value=10000.0, allow_nan=False, allow_infinity=False))
-    @settings(max_examples=100, deadline=1000)
     def test_valid_rate_acceptance_property(self, rate):
         """Test that valid positive rates are accepted."""
-        yaml_content = f"""
-        limits:
-          "0x123": {{ rate: {rate} }}
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            rules = load_rules(path)
-            assert rules["limits"][0x123]["rate"] == float(rate)
-        finally:
-            os.unlink(path)
-
-    @given(rate=st.floats(min_value=0.1, max_value=1000.0, allow_nan=False, allow_infinity=False))
-    @settings(max_examples=100, deadline=1000)
+        rules = load_rules_from_string(_limit_yaml(rate=rate))
+        assert rules["limits"][0x123]["rate"] == float(rate)
+
+    @given(rate=POSITIVE_RATE)
     def test_burst_default_calculation_property(self, rate):
         """Test that default burst calculation follows ceil(rate) property."""
-        yaml_content = f"""
-        limits:
-          "0x123": {{ rate: {rate} }}
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            rules = load_rules(path)
-            expected_burst = math.ceil(rate)
-            assert rules["limits"][0x123]["burst"] == expected_burst
-            assert rules["limits"][0x123]["burst"] >= rate  # Burst should always be >= rate
-        finally:
-            os.unlink(path)
+        rules = validate_rules(_limits_doc(rate=rate))
+        expected_burst = math.ceil(rate)
+        assert rules["limits"][0x123]["burst"] == expected_burst
+        assert rules["limits"][0x123]["burst"] >= rate  # Burst should always be >= rate
 
     @given(
-        rate=st.floats(min_value=0.1, max_value=1000.0, allow_nan=False, allow_infinity=False),
+        rate=POSITIVE_RATE,
         burst=st.integers(min_value=1, max_value=2000)
     )
-    @settings(max_examples=100, deadline=1000)
     def test_explicit_burst_property(self, rate, burst):
         """Test that explicit burst values are preserved when valid."""
-        yaml_content = f"""
-        limits:
-          "0x123": {{ rate: {rate}, burst: {burst} }}
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            rules = load_rules(path)
-            assert rules["limits"][0x123]["rate"] == float(rate)
-            assert rules["limits"][0x123]["burst"] == burst
-        finally:
-            os.unlink(path)
+        rules = validate_rules(_limits_doc(rate=rate, burst=burst))
+        assert rules["limits"][0x123]["rate"] == float(rate)
+        assert rules["limits"][0x123]["burst"] == burst
 
     @given(rate=st.one_of(
         st.floats(max_value=0.0, allow_nan=False, allow_infinity=False),
         st.floats(min_value=-1000.0, max_value=-0.1, allow_nan=False, allow_infinity=False)
     ))
-    @settings(max_examples=50, deadline=1000)
     def test_invalid_rate_rejection_property(self, rate):
         """Test that non-positive rates are consistently rejected."""
-        yaml_content = f"""
-        limits:
-          "0x123": {{ rate: {rate} }}
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            with pytest.raises(RuleError, match="must be > 0"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        with pytest.raises(RuleError, match=_RATE_NOT_POSITIVE_RE):
+            validate_rules(_limits_doc(rate=rate))
 
     @given(burst=st.integers(max_value=0))
-    @settings(max_examples=50, deadline=1000)
     def test_invalid_burst_rejection_property(self, burst):
         """Test that non-positive burst values are consistently rejected."""
-        yaml_content = f"""
-        limits:
-          "0x123": {{ rate: 10.0, burst: {burst} }}
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            with pytest.raises(RuleError, match="must be >= 1"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        with pytest.raises(RuleError, match=_BURST_BELOW_ONE_RE):
+            validate_rules(_limits_doc(rate=10.0, burst=burst))
 
 
 class TestDropListProperties:
     """Property-based tests for drop list validation."""
 
     @given(drop_ids=st.lists(
-        st.integers(min_value=0, max_value=MAX_CAN_ID), 
+        VALID_CAN_ID, 
         min_size=1, 
         max_size=50,
         unique=True
     ))
-    @settings(max_examples=50, deadline=2000)
     def test_drop_list_normalization_property(self, drop_ids):
         """Test that drop lists are properly normalized to sets."""
-        # Convert to YAML list format
-        yaml_drop_list = ", ".join(f'"0x{cid:X}"' for cid in drop_ids)
-        yaml_content = f"""
-        actions:
-          drop: [{yaml_drop_list}]
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            rules = load_rules(path)
-            
-            # Should normalize to set with same IDs
-            assert isinstance(rules["drop"], set)
-            assert len(rules["drop"]) == len(drop_ids)
-            assert rules["drop"] == set(drop_ids)
-        finally:
-            os.unlink(path)
+        rules = validate_rules({"actions": {"drop": [f"0x{cid:X}" for cid in drop_ids]}})
+        
+        # Should normalize to set with same IDs
+        assert isinstance(rules["drop"], set)
+        assert len(rules["drop"]) == len(drop_ids)
+        assert rules["drop"] == set(drop_ids)
 
     @given(drop_ids=st.lists(
-        st.integers(min_value=0, max_value=MAX_CAN_ID),
+        VALID_CAN_ID,
         min_size=1,
         max_size=20
     ))  # Note: not unique=True to test duplicate handling
-    @settings(max_examples=50, deadline=2000)
     def test_drop_list_deduplication_property(self, drop_ids):
         """Test that duplicate IDs in drop lists are deduplicated."""
         yaml_drop_list = ", ".join(f'"0x{cid:X}"' for cid in drop_ids)
-        yaml_content = f"""
-        actions:
-          drop: [{yaml_drop_list}]
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            rules = load_rules(path)
-            
-            # Set should contain only unique IDs
-            unique_ids = set(drop_ids)
-            assert rules["drop"] == unique_ids
-            assert len(rules["drop"]) == len(unique_ids)
-        finally:
-            os.unlink(path)
+        rules = load_rules_from_string(_DROP_TMPL.format(ids=yaml_drop_list))
+        
+        # Set should contain only unique IDs
+        unique_ids = set(drop_ids)
+        assert rules["drop"] == unique_ids
+        assert len(rules["drop"]) == len(unique_ids)
 
 
 class TestRemapProperties:  
@@ -236,153 +234,65 @@ class TestRemapProperties:
         max_size=20,
         unique_by=lambda x: x[0]  # Unique by from_id to avoid duplicates
     ))
-    @settings(max_examples=50, deadline=2000)
     def test_remap_normalization_property(self, remap_pairs):
         """Test that remap lists are properly normalized to dictionaries."""
-        # Build YAML remap list
-        remap_items = []
-        for from_id, to_id in remap_pairs:
-            remap_items.append(f'{{ from: "0x{from_id:X}", to: "0x{to_id:X}" }}')
+        remap_list = [{"from": f"0x{from_id:X}", "to": f"0x{to_id:X}"} for from_id, to_id in remap_pairs]
+        rules = validate_rules({"actions": {"remap": remap_list}})
         
-        yaml_content = f"""
-        actions:
-          remap: [{", ".join(remap_items)}]
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            rules = load_rules(path)
-            
-            # Should normalize to dict
-            assert isinstance(rules["remap"], dict)
-            assert len(rules["remap"]) == len(remap_pairs)
-            
-            # Verify all mappings
-            for from_id, to_id in remap_pairs:
-                assert rules["remap"][from_id] == to_id
-        finally:
-            os.unlink(path)
-
-    @given(can_id=st.integers(min_value=0, max_value=MAX_CAN_ID))
-    @settings(max_examples=50, deadline=1000)
+        # Should normalize to dict
+        assert isinstance(rules["remap"], dict)
+        assert len(rules["remap"]) == len(remap_pairs)
+        
+        # Verify all mappings
+        for from_id, to_id in remap_pairs:
+            assert rules["remap"][from_id] == to_id
+
+    @given(can_id=VALID_CAN_ID)
     def test_remap_identical_ids_property(self, can_id):
         """Test that identical from/to IDs are rejected."""
         from_id = to_id = can_id  # Always identical
         
-        yaml_content = f"""
-        actions:
-          remap:
-            - {{ from: "0x{from_id:X}", to: "0x{to_id:X}" }}
-        """
-        path = _write_tmp(yaml_content)
-        try:
-            with pytest.raises(RuleError, match="from and to are identical"):
-                load_rules(path)
-        finally:
-            os.unlink(path)
+        remap_item = f'{{ from: "0x{from_id:X}", to: "0x{to_id:X}" }}'
+        with pytest.raises(RuleError, match=_REMAP_IDENTICAL_RE):
+            load_rules_from_string(_REMAP_TMPL.format(items=remap_item))
 
 
 class TestStructuralProperties:
     """Property-based tests for overall structure validation."""
 
+    @pytest.mark.parametrize("num_limits, num_drops, num_remaps", CONFIG_SIZE_CORNERS)
+    def test_configuration_size_corners(self, num_limits, num_drops, num_remaps):
+        """Test empty, single-entry and maximum-size configurations deterministically."""
+        _assert_config_sizes(num_limits, num_drops, num_remaps)
+
     @given(
         num_limits=st.integers(min_value=0, max_value=50),
         num_drops=st.integers(min_value=0, max_value=30),
         num_remaps=st.integers(min_value=0, max_value=20)
     )
-    @settings(max_examples=50, deadline=3000)
     def test_configuration_size_scaling_property(self, num_limits, num_drops, num_remaps):
         """Test that configurations scale properly with increasing size."""
-        # Generate unique CAN IDs for each section
-        limits_yaml = []
-        drops_yaml = []
-        remaps_yaml = []
-        
-        # Generate limits
-        for i in range(num_limits):
-            can_id = 0x100 + i
-            rate = 10 + (i % 50)
-            limits_yaml.append(f'  "0x{can_id:X}": {{ rate: {rate} }}')
-        
-        # Generate drops (different ID range)
-        for i in range(num_drops):
-            can_id = 0x200 + i
-            drops_yaml.append(f'"0x{can_id:X}"')
-        
-        # Generate remaps (different ID ranges)
-        for i in range(num_remaps):
-            from_id = 0x300 + i
-            to_id = 0x400 + i
-            remaps_yaml.append(f'{{ from: "0x{from_id:X}", to: "0x{to_id:X}" }}')
-        
-        # Build complete YAML with proper formatting
-        yaml_parts = []
-        if limits_yaml:
-            yaml_parts.extend(["limits:"] + limits_yaml)
-        if drops_yaml or remaps_yaml:
-            yaml_parts.append("actions:")
-            if drops_yaml:
-                yaml_parts.append("  drop:")
-                for drop_id in drops_yaml:
-                    yaml_parts.append(f"    - {drop_id}")
-            if remaps_yaml:
-                yaml_parts.append("  remap:")
-                for remap_item in remaps_yaml:
-                    yaml_parts.append(f"    - {remap_item}")
-        
-        if not yaml_parts:
-            yaml_content = "{}"  # Empty config
-        else:
-            yaml_content = "\n".join(yaml_parts)
-        
-        path = _write_tmp(yaml_content)
-        try:
-            rules = load_rules(path)
-            
-            # Verify correct parsing
-            assert len(rules["limits"]) == num_limits
-            assert len(rules["drop"]) == num_drops  
-            assert len(rules["remap"]) == num_remaps
-            
-            # Verify structure invariants
-            assert isinstance(rules["limits"], dict)
-            assert isinstance(rules["drop"], set)
-            assert isinstance(rules["remap"], dict)
-            
-        finally:
-            os.unlink(path)
-
-    @given(data=st.data())
-    @settings(max_examples=30, deadline=2000)
-    def test_mixed_id_format_consistency_property(self, data):
+        # Steer the search toward larger documents; the corners are covered above
+        target(float(num_limits + num_drops + num_remaps), label="config_size")
+        _assert_config_sizes(num_limits, num_drops, num_remaps)
+
+    @given(case=can_id_spellings())
+    def test_mixed_id_format_consistency_property(self, make_yaml, case):
         """Test that mixed ID formats produce consistent results."""
-        # Generate a CAN ID and represent it in different formats
-        can_id = data.draw(st.integers(min_value=0, max_value=MAX_CAN_ID))
-        
-        formats = [
-            str(can_id),           # Decimal string
-            f"0x{can_id:X}",       # Hex string lowercase
-            f"0X{can_id:X}",       # Hex string uppercase  
-            can_id,                # Integer
-        ]
+        can_id, (limit_key, drop_item) = case
         
         # Use different formats in same config
-        chosen_formats = data.draw(st.lists(st.sampled_from(formats), min_size=2, max_size=4, unique=True))
+        yaml_content = f"""
+        limits:
+          {repr(limit_key)}: {{ rate: 10 }}
+        actions:
+          drop: [{repr(drop_item)}]
+        """
+        
+        # Keep one property on the path-based API; make_yaml writes into the
+        # session tmp directory, which pytest removes in bulk
+        rules = load_rules(make_yaml(yaml_content))
         
-        if len(chosen_formats) >= 2:
-            yaml_content = f"""
-            limits:
-              {repr(chosen_formats[0])}: {{ rate: 10 }}
-            actions:
-              drop: [{repr(chosen_formats[1])}]
-            """
-            
-            path = _write_tmp(yaml_content)
-            try:
-                rules = load_rules(path)
-                
-                # Both should resolve to the same CAN ID
-                assert can_id in rules["limits"]
-                assert can_id in rules["drop"]
-                
-            finally:
-                os.unlink(path)
\ No newline at end of file
+        # Both should resolve to the same CAN ID
+        assert can_id in rules["limits"]
+        assert can_id in rules["drop"]
\ No newline at end of file
@@ -1,8 +1,10 @@
 # tests/test_shaper.py
+import itertools
+import sys
 import pytest
 from unittest.mock import Mock, patch, call
 import time
-from socketcan_sa.shaper import run_bridge, RECV_TIMEOUT, SEND_TIMEOUT
+from socketcan_sa.shaper import main, run_bridge, RECV_TIMEOUT, SEND_TIMEOUT
 import can
 
 
@@ -94,8 +96,8 @@ class TestRunBridge:
         mock_out_bus = Mock()
         mock_bus_class.side_effect = [mock_in_bus, mock_out_bus]
         
-        # Mock time progression
-        mock_time.side_effect = [0.0, 0.5, 1.1, 1.1]  # Start, during frame, stats time, final
+        # Mock time progression: 0.0 at start, 0.6 on the frame, 1.2 (past the interval) after
+        mock_time.side_effect = itertools.count(0.0, 0.6).__next__
         
         test_frame = Mock()
         test_frame.arbitration_id = 0x789
@@ -111,9 +113,6 @@ class TestRunBridge:
 
     def test_main_validates_stats_interval(self, capsys):
         """Test that main function validates stats interval parameter."""
-        import sys
-        from socketcan_sa.shaper import main
-        
         # Mock command line args with invalid interval
         test_args = ["shaper.py", "--if-in", "vcan0", "--if-out", "vcan1", "--stats-interval", "-1.0"]
         
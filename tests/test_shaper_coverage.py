@@ -1,31 +1,29 @@
 """
 Additional tests to improve shaper.py coverage.
 """
+import importlib
+import sys
 import pytest
 from unittest.mock import patch, Mock
-from socketcan_sa.shaper import main
+from socketcan_sa.shaper import main, run_bridge
 import socketcan_sa.shaper
+import can
 
 
 def test_import_error_handling():
     """Test that missing python-can raises SystemExit with helpful message."""
     # This tests the ImportError handling on lines 38-39
+    # patch.dict restores sys.modules on exit, including the cached shaper module
     with patch.dict('sys.modules', {'can': None}):
         with pytest.raises(SystemExit, match="python-can is required"):
             # This will trigger the import error since 'can' is None
-            import importlib
-            import sys
-            # Temporarily remove from cache if present
-            if 'socketcan_sa.shaper' in sys.modules:
-                del sys.modules['socketcan_sa.shaper'] 
+            sys.modules.pop('socketcan_sa.shaper', None)
             importlib.import_module('socketcan_sa.shaper')
 
 
 @patch('socketcan_sa.shaper.can.interface.Bus')
 def test_send_error_handling(mock_bus_class):
     """Test CAN send error path."""
-    from socketcan_sa.shaper import run_bridge
-    
     mock_in_bus = Mock()
     mock_out_bus = Mock()
     mock_bus_class.side_effect = [mock_in_bus, mock_out_bus]
@@ -41,7 +39,6 @@ def test_send_error_handling(mock_bus_class):
     test_frame.error_state_indicator = False
     
     # Make send() raise CanError to trigger error path (line 118)
-    import can
     mock_out_bus.send.side_effect = can.CanError("Send failed")
     mock_in_bus.recv.side_effect = [test_frame, KeyboardInterrupt()]
     
@@ -75,6 +75,8 @@ def vcan_interfaces():
         pass
 
 
+# vcan0/vcan1 are shared kernel interfaces; keep these tests on one xdist worker
+@pytest.mark.xdist_group("vcan")
 @pytest.mark.integration
 class TestShapingIntegration:
     """Integration tests using real virtual CAN interfaces."""
@@ -108,7 +110,7 @@ class TestShapingIntegration:
         with managed_bridge("vcan0", "vcan1", 1.0):
             sender_bus = can.interface.Bus(channel="vcan0", interface="socketcan")
             receiver_bus = can.interface.Bus(channel="vcan1", interface="socketcan")
-            
+        
             try:
                 # Send extended ID frame
                 test_msg = can.Message(
@@ -117,13 +119,13 @@ class TestShapingIntegration:
                     is_extended_id=True
                 )
                 sender_bus.send(test_msg)
-                
+            
                 received = receiver_bus.recv(timeout=1.0)
-                
+            
                 assert received is not None
                 assert received.arbitration_id == 0x1FFFFFFF
                 assert received.is_extended_id is True
-                
+            
             finally:
                 sender_bus.shutdown()
                 receiver_bus.shutdown()
\ No newline at end of file
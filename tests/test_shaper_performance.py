@@ -1,5 +1,6 @@
 import pytest
 import time
+from itertools import chain, repeat
 from unittest.mock import Mock, patch
 from socketcan_sa.shaper import run_bridge
 
@@ -18,18 +19,8 @@ def test_bridge_throughput_target(mock_bus_class):
     test_frame.data = b'\x01\x02\x03\x04'
     test_frame.is_extended_id = False
     
-    frame_count = 0
-    def mock_recv(timeout):
-        nonlocal frame_count
-        if frame_count < 1000:
-            frame_count += 1
-            return test_frame
-        elif frame_count == 1000:
-            frame_count += 1
-            raise KeyboardInterrupt()  # Stop after 1000 frames
-        return None
-    
-    mock_in_bus.recv.side_effect = mock_recv
+    # 1000 frames, then stop; Mock consumes the iterator natively
+    mock_in_bus.recv.side_effect = chain(repeat(test_frame, 1000), [KeyboardInterrupt()])
     
     start_time = time.time()
     run_bridge("vcan0", "vcan1", quiet=True)
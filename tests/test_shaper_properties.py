@@ -4,16 +4,24 @@ from unittest.mock import Mock, patch
 from socketcan_sa.shaper import run_bridge
 
 
+@pytest.fixture(scope="module")
+def bus_mocks():
+    """Patch ``can.interface.Bus`` once for the module and yield ``(bus_class, in_bus, out_bus)``."""
+    with patch('socketcan_sa.shaper.can.interface.Bus') as mock_bus_class:
+        yield mock_bus_class, Mock(), Mock()
+
+
 @given(
     can_id=st.integers(min_value=0, max_value=0x7FF),  # Standard CAN ID range
     data_len=st.integers(min_value=0, max_value=8),     # Valid DLC range
     stats_interval=st.floats(min_value=0.1, max_value=10.0)
 )
-@patch('socketcan_sa.shaper.can.interface.Bus')
-def test_bridge_handles_valid_frame_ranges(mock_bus_class, can_id, data_len, stats_interval):
+def test_bridge_handles_valid_frame_ranges(bus_mocks, can_id, data_len, stats_interval):
     """Test bridge with property-based valid CAN frames."""
-    mock_in_bus = Mock()
-    mock_out_bus = Mock()
+    # The module-scoped mocks are shared by every example, so reset them per draw
+    mock_bus_class, mock_in_bus, mock_out_bus = bus_mocks
+    mock_in_bus.reset_mock()
+    mock_out_bus.reset_mock()
     mock_bus_class.side_effect = [mock_in_bus, mock_out_bus]
     
     # Create frame with generated properties